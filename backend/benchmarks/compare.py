@@ -0,0 +1,60 @@
+# benchmarks/compare.py
+"""
+Сравнение двух прогонов benchmarks.run.
+
+    python -m benchmarks.compare                       # два последних файла из benchmarks/results
+    python -m benchmarks.compare old.json new.json
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Optional
+
+from benchmarks.run import RESULTS_DIR
+
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "rps", "queries_per_request"]
+
+
+def load(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def delta(old: Optional[float], new: Optional[float]) -> str:
+    if old is None or new is None:
+        return "n/a"
+    if not old:
+        return f"{new}"
+    return f"{new} ({(new - old) / old * 100:+.1f}%)"
+
+
+def label(report: dict) -> str:
+    return f"{report['commit']}{'+dirty' if report.get('dirty') else ''} @ {report['timestamp']}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old", nargs="?", type=Path)
+    parser.add_argument("new", nargs="?", type=Path)
+    args = parser.parse_args()
+
+    if args.old is None or args.new is None:
+        files = sorted(RESULTS_DIR.glob("*.json"))
+        if len(files) < 2:
+            raise SystemExit(f"Need two result files in {RESULTS_DIR}")
+        args.old, args.new = files[-2], files[-1]
+
+    old, new = load(args.old), load(args.new)
+    print(f"old: {label(old)}")
+    print(f"new: {label(new)}")
+    if old.get("dataset") != new.get("dataset"):
+        print("warning: datasets differ, numbers are not directly comparable")
+
+    print(f"{'scenario':<24}" + "".join(f"{m:>26}" for m in METRICS))
+    for name in sorted(set(old["scenarios"]) | set(new["scenarios"])):
+        old_stats = old["scenarios"].get(name, {})
+        new_stats = new["scenarios"].get(name, {})
+        print(f"{name:<24}" + "".join(f"{delta(old_stats.get(m), new_stats.get(m)):>26}" for m in METRICS))
+
+
+if __name__ == "__main__":
+    main()
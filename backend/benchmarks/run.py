@@ -0,0 +1,233 @@
+# benchmarks/run.py
+"""
+Нагрузочный прогон горячих эндпоинтов через ASGI-клиент (без сети и uvicorn).
+
+    cd backend
+    python -m benchmarks.seed
+    python -m benchmarks.run --concurrency 16 --requests 2000
+    python -m benchmarks.compare            # два последних прогона
+
+Для каждого сценария: p50/p95/p99, среднее, пропускная способность и SQL-запросов на запрос.
+Результат пишется в benchmarks/results/<время>-<коммит>.json.
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.seed import BENCH_EMAIL, BENCH_PASSWORD, CITIES
+from src.database.connection import AsyncSessionLocal, engine
+from src.main import app
+from src.realtime.broker import start_broker, stop_broker
+from src.utils.query_log import capture_queries, install_query_log_hooks
+from src.utils.security import create_access_token
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SAMPLE_SIZE = 500
+SCENARIOS = ["search_items", "get_messages", "send_message", "login", "get_user_conversations"]
+
+Scenario = Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+
+
+class Fixtures:
+    """Существующие в БД пользователи и беседы, на которых гоняем сценарии"""
+
+    def __init__(self, participants: List[tuple], user_count: int):
+        self.participants = participants
+        self.user_count = user_count
+        self.tokens = {
+            user_id: {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+            for user_id, _ in participants
+        }
+
+    def participant(self, rng: random.Random):
+        user_id, conversation_id = rng.choice(self.participants)
+        return self.tokens[user_id], conversation_id
+
+
+async def load_fixtures() -> Fixtures:
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(
+            text(
+                "SELECT user_id, conversation_id FROM conversation_participants "
+                "ORDER BY random() LIMIT :limit"
+            ),
+            {"limit": SAMPLE_SIZE},
+        )).all()
+        user_count = (await session.execute(text("SELECT count(*) FROM users"))).scalar_one()
+    if not rows:
+        raise SystemExit("No conversations found, run `python -m benchmarks.seed` first")
+    return Fixtures([(row.user_id, row.conversation_id) for row in rows], user_count)
+
+
+async def dataset_size() -> Dict[str, int]:
+    async with AsyncSessionLocal() as session:
+        rows = await session.execute(text(
+            "SELECT relname, reltuples::bigint AS rows FROM pg_class "
+            "WHERE relname IN ('users', 'items', 'categories', 'conversations', 'messages')"
+        ))
+        return {row.relname: row.rows for row in rows}
+
+
+def build_scenarios(fixtures: Fixtures) -> Dict[str, Scenario]:
+    async def search_items(client, rng):
+        lat, lon, spread = rng.choice(CITIES)
+        params = {"lat": rng.gauss(lat, spread / 2), "lon": rng.gauss(lon, spread), "radius": 5}
+        return await client.get("/api/items/", params=params)
+
+    async def get_messages(client, rng):
+        headers, conversation_id = fixtures.participant(rng)
+        return await client.get(f"/api/chats/{conversation_id}/messages", headers=headers, params={"limit": 50})
+
+    async def send_message(client, rng):
+        headers, conversation_id = fixtures.participant(rng)
+        return await client.post(
+            f"/api/chats/{conversation_id}/messages", headers=headers, params={"text": f"bench {uuid.uuid4()}"}
+        )
+
+    async def login(client, rng):
+        email = BENCH_EMAIL.format(rng.randrange(fixtures.user_count))
+        return await client.post("/api/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+
+    async def get_user_conversations(client, rng):
+        headers, _ = fixtures.participant(rng)
+        return await client.get("/api/chats/", headers=headers)
+
+    return {
+        "search_items": search_items,
+        "get_messages": get_messages,
+        "send_message": send_message,
+        "login": login,
+        "get_user_conversations": get_user_conversations,
+    }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Перцентиль методом nearest-rank"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[rank]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int, warmup: int, seed: int
+) -> Dict[str, float]:
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        await scenario(client, rng)
+
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            with capture_queries() as log:
+                started = time.perf_counter()
+                response = await scenario(client, rng)
+                latencies.append(time.perf_counter() - started)
+            queries.append(log.count)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "rps": round(len(latencies) / wall, 1),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+    }
+
+
+def git_commit() -> Dict[str, object]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def print_table(results: Dict[str, Dict[str, float]]) -> None:
+    columns = ["requests", "errors", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "rps", "queries_per_request"]
+    print(f"{'scenario':<24}" + "".join(f"{c:>20}" for c in columns))
+    for name, stats in results.items():
+        print(f"{name:<24}" + "".join(f"{stats[c]:>20}" for c in columns))
+
+
+async def run(args) -> None:
+    install_query_log_hooks(engine)
+    await start_broker()
+    try:
+        fixtures = await load_fixtures()
+        scenarios = build_scenarios(fixtures)
+        selected = args.scenario or list(scenarios)
+
+        results = {}
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for name in selected:
+                print(f"running {name}...", flush=True)
+                results[name] = await run_scenario(
+                    client, scenarios[name], args.requests, args.concurrency, args.warmup, args.seed
+                )
+        dataset = await dataset_size()
+    finally:
+        await stop_broker()
+        await engine.dispose()
+
+    print_table(results)
+
+    report = {
+        **git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "concurrency": args.concurrency,
+        "dataset": dataset,
+        "scenarios": results,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = RESULTS_DIR / f"{stamp}-{report['commit']}.json"
+    path.write_text(json.dumps(report, indent=2))
+    print(f"results: {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark hot API endpoints against the local database")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="warm-up requests per scenario (not measured)")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="run only these scenarios (repeatable)")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
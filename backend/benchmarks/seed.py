@@ -0,0 +1,247 @@
+# benchmarks/seed.py
+"""
+Наполнение локальной БД данными для бенчмарков.
+
+    cd backend
+    python -m benchmarks.seed --items 300000 --messages 2000000
+
+Схема доводится миграциями до head, все таблицы приложения очищаются (TRUNCATE).
+Данные детерминированы параметром --seed (время создания — относительно момента запуска).
+Пользователи, категории и предметы грузятся через COPY (geohash считается в Python),
+беседы и сообщения генерируются на стороне Postgres через generate_series: random()
+засевается через setseed, id — md5 от номера строки и --seed.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+import asyncpg
+
+from src.config import settings
+from src.database.migrate import alembic_config
+from src.utils.geo import geohash_encode
+from src.utils.security import get_password_hash
+
+BENCH_PASSWORD = "bench-password"
+BENCH_EMAIL = "bench{}@example.com"
+
+# Центры «городов» (lat, lon, разброс в градусах): предметы кучкуются, как в реальности
+CITIES = [
+    (55.7558, 37.6173, 0.25),
+    (59.9343, 30.3351, 0.20),
+    (56.8389, 60.6057, 0.15),
+    (55.0084, 82.9357, 0.15),
+    (43.5855, 39.7231, 0.10),
+    (52.5200, 13.4050, 0.20),
+]
+# Доля предметов, разбросанных равномерно вне городов
+RURAL_SHARE = 0.1
+
+WORDS = [
+    "drill", "bike", "tent", "camera", "ladder", "projector", "kayak", "saw", "speaker", "drone",
+    "дрель", "велосипед", "палатка", "камера", "лестница", "проектор", "байдарка", "пила", "колонка",
+]
+
+TABLES = [
+    "messages", "conversation_participants", "conversations", "reviews", "rentals",
+    "item_images", "items", "categories", "user_auth", "users",
+]
+
+
+def build_categories(rng: random.Random, roots: int, depth: int, branching: int) -> List[Tuple]:
+    """Дерево категорий: roots корней, каждый узел до глубины depth имеет branching детей"""
+    rows = []
+    level = []
+    for i in range(roots):
+        node = uuid.UUID(int=rng.getrandbits(128), version=4)
+        rows.append((node, f"category {i}", None))
+        level.append((node, f"category {i}"))
+    for _ in range(depth - 1):
+        next_level = []
+        for parent, name in level:
+            for j in range(branching):
+                node = uuid.UUID(int=rng.getrandbits(128), version=4)
+                child_name = f"{name}.{j}"
+                rows.append((node, child_name, parent))
+                next_level.append((node, child_name))
+        level = next_level
+    return rows
+
+
+def random_point(rng: random.Random) -> Tuple[float, float]:
+    if rng.random() < RURAL_SHARE:
+        return rng.uniform(41.0, 70.0), rng.uniform(20.0, 140.0)
+    lat, lon, spread = rng.choice(CITIES)
+    return rng.gauss(lat, spread), rng.gauss(lon, spread * 1.8)
+
+
+def build_items(
+    rng: random.Random, count: int, user_ids: List[uuid.UUID], category_ids: List[uuid.UUID]
+) -> List[Tuple]:
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        lat, lon = random_point(rng)
+        title = " ".join(rng.sample(WORDS, 2))
+        price_per_day = round(rng.uniform(100, 5000), 2) if rng.random() < 0.9 else None
+        price_per_hour = round(price_per_day / 6, 2) if price_per_day and rng.random() < 0.5 else None
+        rows.append((
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            rng.choice(user_ids),
+            rng.choice(category_ids),
+            f"{title} #{i}",
+            f"{title} for rent, good condition",
+            price_per_hour,
+            price_per_day,
+            f"address {i}",
+            round(lat, 7),
+            round(lon, 7),
+            geohash_encode(lat, lon),
+            rng.random() < 0.95,
+            now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+        ))
+    return rows
+
+
+async def seed(args) -> None:
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+
+    # Как перед запуском приложения: в verify-режиме оно не стартует без alembic_version
+    from alembic import command
+
+    await asyncio.to_thread(command.upgrade, alembic_config(), "head")
+
+    conn = await asyncpg.connect(settings.DATABASE_URL_dsn)
+    try:
+        await conn.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE")
+
+        # Один bcrypt-хеш на всех: регистрация не то, что мы меряем
+        password_hash = get_password_hash(BENCH_PASSWORD)
+        user_ids = [uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(args.users)]
+        await conn.copy_records_to_table(
+            "users",
+            records=[(uid, BENCH_EMAIL.format(i), f"Bench User {i}", False) for i, uid in enumerate(user_ids)],
+            columns=["id", "email", "full_name", "is_blocked"],
+        )
+        await conn.copy_records_to_table(
+            "user_auth",
+            records=[(uid, password_hash) for uid in user_ids],
+            columns=["user_id", "password_hash"],
+        )
+        print(f"users: {len(user_ids)}")
+
+        categories = build_categories(rng, args.category_roots, args.category_depth, args.category_branching)
+        await conn.copy_records_to_table("categories", records=categories, columns=["id", "name", "parent_id"])
+        category_ids = [row[0] for row in categories]
+        print(f"categories: {len(categories)}")
+
+        item_columns = [
+            "id", "owner_id", "category_id", "title", "description", "price_per_hour", "price_per_day",
+            "address", "latitude", "longitude", "geohash", "is_available", "created_at",
+        ]
+        for offset in range(0, args.items, args.batch_size):
+            batch = build_items(rng, min(args.batch_size, args.items - offset), user_ids, category_ids)
+            await conn.copy_records_to_table("items", records=batch, columns=item_columns)
+        print(f"items: {args.items}")
+
+        # Беседы: случайный предмет, участники — владелец и случайный арендатор.
+        # Нумерация по id, а не по физическому порядку строк
+        await conn.execute(
+            """
+            CREATE TEMP TABLE bench_items AS SELECT row_number() OVER (ORDER BY id) AS n, id, owner_id FROM items;
+            CREATE INDEX ON bench_items (n);
+            CREATE TEMP TABLE bench_users AS SELECT row_number() OVER (ORDER BY id) AS n, id FROM users;
+            CREATE INDEX ON bench_users (n);
+            """
+        )
+        # random() на стороне Postgres — из того же --seed
+        await conn.execute("SELECT setseed($1)", rng.random())
+        await conn.execute(
+            """
+            CREATE TEMP TABLE bench_conversations AS
+            SELECT r.g AS n, md5($4 || ':conversation:' || r.g)::uuid AS id,
+                   i.id AS item_id, i.owner_id, u.id AS tenant_id
+            FROM (
+                SELECT g, 1 + floor(random() * $2)::bigint AS item_n, 1 + floor(random() * $3)::bigint AS user_n
+                FROM generate_series(1, $1) AS g
+            ) AS r
+            JOIN bench_items AS i ON i.n = r.item_n
+            JOIN bench_users AS u ON u.n = r.user_n
+            """,
+            args.conversations, args.items, args.users, str(args.seed),
+        )
+        await conn.execute("CREATE INDEX ON bench_conversations (n)")
+        await conn.execute("INSERT INTO conversations (id, item_id) SELECT id, item_id FROM bench_conversations")
+        await conn.execute(
+            """
+            INSERT INTO conversation_participants (conversation_id, user_id, is_active)
+            SELECT id, owner_id, true FROM bench_conversations
+            UNION
+            SELECT id, tenant_id, true FROM bench_conversations
+            """
+        )
+        print(f"conversations: {args.conversations}")
+
+        # Сообщения: равномерно по беседам, отправитель чередуется между участниками
+        await conn.execute(
+            """
+            INSERT INTO messages (id, conversation_id, sender_id, message_text, message_type, is_read, created_at)
+            SELECT md5($3 || ':message:' || g)::uuid, c.id,
+                   CASE WHEN g % 2 = 0 THEN c.owner_id ELSE c.tenant_id END,
+                   'message ' || g, 'text', false,
+                   now() - make_interval(secs => ($1 - g))
+            FROM generate_series(1, $1) AS g
+            JOIN bench_conversations AS c ON c.n = 1 + (g % $2)
+            """,
+            args.messages, args.conversations, str(args.seed),
+        )
+        await conn.execute(
+            """
+            UPDATE conversations AS c
+            SET last_message_id = m.id, last_message_at = m.created_at
+            FROM (
+                SELECT DISTINCT ON (conversation_id) conversation_id, id, created_at
+                FROM messages
+                ORDER BY conversation_id, created_at DESC, id DESC
+            ) AS m
+            WHERE m.conversation_id = c.id
+            """
+        )
+        await conn.execute(
+            """
+            UPDATE conversation_participants AS p
+            SET last_message_at = c.last_message_at
+            FROM conversations AS c
+            WHERE c.id = p.conversation_id AND c.last_message_at IS NOT NULL
+            """
+        )
+        print(f"messages: {args.messages}")
+
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
+
+    print(f"seeded in {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the database for benchmarks (TRUNCATEs all tables)")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--items", type=int, default=300000)
+    parser.add_argument("--conversations", type=int, default=50000)
+    parser.add_argument("--messages", type=int, default=2000000)
+    parser.add_argument("--category-roots", type=int, default=8)
+    parser.add_argument("--category-depth", type=int, default=6)
+    parser.add_argument("--category-branching", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(seed(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""baseline schema: tables as originally created by Base.metadata.create_all
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('categories',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('parent_id', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['categories.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_categories_name'), 'categories', ['name'], unique=False)
+    op.create_index(op.f('ix_categories_parent_id'), 'categories', ['parent_id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('is_blocked', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_phone'), 'users', ['phone'], unique=True)
+    op.create_table('items',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('category_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('price_per_hour', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('price_per_day', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('latitude', sa.Numeric(precision=10, scale=7), nullable=True),
+    sa.Column('longitude', sa.Numeric(precision=10, scale=7), nullable=True),
+    sa.Column('is_available', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_items_category_id'), 'items', ['category_id'], unique=False)
+    op.create_index(op.f('ix_items_is_available'), 'items', ['is_available'], unique=False)
+    op.create_index(op.f('ix_items_latitude'), 'items', ['latitude'], unique=False)
+    op.create_index(op.f('ix_items_longitude'), 'items', ['longitude'], unique=False)
+    op.create_index(op.f('ix_items_owner_id'), 'items', ['owner_id'], unique=False)
+    op.create_table('user_auth',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('password_hash', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('conversations',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_conversations_item_id'), 'conversations', ['item_id'], unique=False)
+    op.create_table('item_images',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('image_url', sa.String(), nullable=False),
+    sa.Column('order_index', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_item_images_item_id'), 'item_images', ['item_id'], unique=False)
+    op.create_index(op.f('ix_item_images_order_index'), 'item_images', ['order_index'], unique=False)
+    op.create_table('rentals',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('item_id', sa.UUID(), nullable=False),
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('total_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('starts_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('ends_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('owner_confirmation', sa.Boolean(), nullable=True),
+    sa.Column('tenant_confirmation', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('confirmed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['tenant_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_rentals_item_id'), 'rentals', ['item_id'], unique=False)
+    op.create_index(op.f('ix_rentals_status'), 'rentals', ['status'], unique=False)
+    op.create_index(op.f('ix_rentals_tenant_id'), 'rentals', ['tenant_id'], unique=False)
+    op.create_table('conversation_participants',
+    sa.Column('conversation_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('joined_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('conversation_id', 'user_id')
+    )
+    op.create_index(op.f('ix_conversation_participants_is_active'), 'conversation_participants', ['is_active'], unique=False)
+    op.create_table('messages',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('conversation_id', sa.UUID(), nullable=False),
+    sa.Column('sender_id', sa.UUID(), nullable=False),
+    sa.Column('message_text', sa.Text(), nullable=False),
+    sa.Column('message_type', sa.String(), nullable=True),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_messages_conversation_id'), 'messages', ['conversation_id'], unique=False)
+    op.create_index(op.f('ix_messages_is_read'), 'messages', ['is_read'], unique=False)
+    op.create_index(op.f('ix_messages_sender_id'), 'messages', ['sender_id'], unique=False)
+    op.create_table('reviews',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('rental_id', sa.UUID(), nullable=False),
+    sa.Column('author_id', sa.UUID(), nullable=False),
+    sa.Column('recipient_id', sa.UUID(), nullable=False),
+    sa.Column('rating', sa.SmallInteger(), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['recipient_id'], ['users.id'], ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['rental_id'], ['rentals.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('rental_id', name='uq_review_rental')
+    )
+    op.create_index(op.f('ix_reviews_author_id'), 'reviews', ['author_id'], unique=False)
+    op.create_index(op.f('ix_reviews_rating'), 'reviews', ['rating'], unique=False)
+    op.create_index(op.f('ix_reviews_recipient_id'), 'reviews', ['recipient_id'], unique=False)
+    op.create_index(op.f('ix_reviews_rental_id'), 'reviews', ['rental_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reviews_rental_id'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_recipient_id'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_rating'), table_name='reviews')
+    op.drop_index(op.f('ix_reviews_author_id'), table_name='reviews')
+    op.drop_table('reviews')
+    op.drop_index(op.f('ix_messages_sender_id'), table_name='messages')
+    op.drop_index(op.f('ix_messages_is_read'), table_name='messages')
+    op.drop_index(op.f('ix_messages_conversation_id'), table_name='messages')
+    op.drop_table('messages')
+    op.drop_index(op.f('ix_conversation_participants_is_active'), table_name='conversation_participants')
+    op.drop_table('conversation_participants')
+    op.drop_index(op.f('ix_rentals_tenant_id'), table_name='rentals')
+    op.drop_index(op.f('ix_rentals_status'), table_name='rentals')
+    op.drop_index(op.f('ix_rentals_item_id'), table_name='rentals')
+    op.drop_table('rentals')
+    op.drop_index(op.f('ix_item_images_order_index'), table_name='item_images')
+    op.drop_index(op.f('ix_item_images_item_id'), table_name='item_images')
+    op.drop_table('item_images')
+    op.drop_index(op.f('ix_conversations_item_id'), table_name='conversations')
+    op.drop_table('conversations')
+    op.drop_table('user_auth')
+    op.drop_index(op.f('ix_items_owner_id'), table_name='items')
+    op.drop_index(op.f('ix_items_longitude'), table_name='items')
+    op.drop_index(op.f('ix_items_latitude'), table_name='items')
+    op.drop_index(op.f('ix_items_is_available'), table_name='items')
+    op.drop_index(op.f('ix_items_category_id'), table_name='items')
+    op.drop_table('items')
+    op.drop_index(op.f('ix_users_phone'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_categories_parent_id'), table_name='categories')
+    op.drop_index(op.f('ix_categories_name'), table_name='categories')
+    op.drop_table('categories')
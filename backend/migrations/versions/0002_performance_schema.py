@@ -0,0 +1,180 @@
+"""performance schema: denormalized counters, geohash, full-text search, hot-path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Столбцы добавляются и заполняются в одной транзакции. Индексы строятся через
+CREATE INDEX CONCURRENTLY вне транзакции, чтобы не блокировать запись в живые таблицы.
+Исключение — items.search_vector: добавление STORED generated-столбца переписывает таблицу.
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.utils.geo import geohash_encode
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+GEOHASH_BACKFILL_BATCH = 5000
+
+# (имя, таблица, колонки, доп. параметры create_index)
+CONCURRENT_INDEXES = [
+    ('ix_items_available_geohash', 'items', ['geohash'], {'postgresql_where': sa.text('is_available')}),
+    ('ix_items_search_vector', 'items', ['search_vector'], {'postgresql_using': 'gin'}),
+    ('ix_messages_conversation_created_id', 'messages', ['conversation_id', 'created_at', 'id'], {}),
+    ('ix_participants_user_last_message', 'conversation_participants',
+     ['user_id', 'last_message_at', 'conversation_id'], {}),
+    ('ix_rentals_item_period', 'rentals', ['item_id', 'starts_at', 'ends_at'], {}),
+    ('ix_reviews_recipient_created_id', 'reviews', ['recipient_id', 'created_at', 'id'], {}),
+]
+DROPPED_INDEXES = [
+    ('ix_items_latitude', 'items', ['latitude']),
+    ('ix_items_longitude', 'items', ['longitude']),
+]
+
+
+def upgrade() -> None:
+    # users: агрегаты отзывов
+    op.add_column('users', sa.Column('review_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+    for rating in range(1, 6):
+        op.add_column('users', sa.Column(f'rating_{rating}_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE users AS u
+        SET review_count = r.review_count,
+            rating_sum = r.rating_sum,
+            rating_1_count = r.c1, rating_2_count = r.c2, rating_3_count = r.c3,
+            rating_4_count = r.c4, rating_5_count = r.c5
+        FROM (
+            SELECT recipient_id,
+                   count(*) AS review_count,
+                   sum(rating) AS rating_sum,
+                   count(*) FILTER (WHERE rating = 1) AS c1,
+                   count(*) FILTER (WHERE rating = 2) AS c2,
+                   count(*) FILTER (WHERE rating = 3) AS c3,
+                   count(*) FILTER (WHERE rating = 4) AS c4,
+                   count(*) FILTER (WHERE rating = 5) AS c5
+            FROM reviews
+            GROUP BY recipient_id
+        ) AS r
+        WHERE r.recipient_id = u.id
+    """)
+
+    # items: geohash, created_at, полнотекстовый поиск
+    op.add_column('items', sa.Column('geohash', sa.String(length=9, collation='C'), nullable=True))
+    op.add_column('items', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.add_column('items', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))", persisted=True),
+        nullable=True,
+    ))
+    _backfill_geohash()
+
+    # conversations / participants: последнее сообщение и непрочитанные
+    op.add_column('conversations', sa.Column('last_message_id', sa.UUID(), nullable=True))
+    op.add_column('conversations', sa.Column('last_message_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key(
+        'fk_conversations_last_message_id', 'conversations', 'messages',
+        ['last_message_id'], ['id'], ondelete='SET NULL',
+    )
+    op.add_column('conversation_participants', sa.Column('last_read_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('conversation_participants', sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('conversation_participants', sa.Column(
+        'last_message_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False,
+    ))
+    op.execute("""
+        UPDATE conversations AS c
+        SET last_message_id = m.id, last_message_at = m.created_at
+        FROM (
+            SELECT DISTINCT ON (conversation_id) conversation_id, id, created_at
+            FROM messages
+            ORDER BY conversation_id, created_at DESC, id DESC
+        ) AS m
+        WHERE m.conversation_id = c.id
+    """)
+    op.execute("""
+        UPDATE conversation_participants AS p
+        SET last_message_at = coalesce(c.last_message_at, c.created_at, p.joined_at, now()),
+            unread_count = (
+                SELECT count(*) FROM messages AS m
+                WHERE m.conversation_id = p.conversation_id
+                  AND m.sender_id <> p.user_id
+                  AND NOT coalesce(m.is_read, false)
+            )
+        FROM conversations AS c
+        WHERE c.id = p.conversation_id
+    """)
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in DROPPED_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        for name, table, columns, kwargs in CONCURRENT_INDEXES:
+            _create_index_concurrently(name, table, columns, **kwargs)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(CONCURRENT_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        for name, table, columns in DROPPED_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+    op.drop_column('conversation_participants', 'last_message_at')
+    op.drop_column('conversation_participants', 'unread_count')
+    op.drop_column('conversation_participants', 'last_read_at')
+    op.drop_constraint('fk_conversations_last_message_id', 'conversations', type_='foreignkey')
+    op.drop_column('conversations', 'last_message_at')
+    op.drop_column('conversations', 'last_message_id')
+    op.drop_column('items', 'search_vector')
+    op.drop_column('items', 'created_at')
+    op.drop_column('items', 'geohash')
+    for rating in range(5, 0, -1):
+        op.drop_column('users', f'rating_{rating}_count')
+    op.drop_column('users', 'rating_sum')
+    op.drop_column('users', 'review_count')
+
+
+def _backfill_geohash() -> None:
+    """geohash считается в Python (src.utils.geo), пачками по id"""
+    bind = op.get_bind()
+    last_id = uuid.UUID(int=0)
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, latitude, longitude FROM items "
+                "WHERE id > :last_id AND latitude IS NOT NULL AND longitude IS NOT NULL "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": GEOHASH_BACKFILL_BATCH},
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE items SET geohash = :geohash WHERE id = :id"),
+            [{"id": row.id, "geohash": geohash_encode(float(row.latitude), float(row.longitude))} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def _create_index_concurrently(name: str, table: str, columns, **kwargs) -> None:
+    """
+    CREATE INDEX CONCURRENTLY. Прерванная сборка оставляет невалидный индекс,
+    который IF NOT EXISTS молча пропустил бы, поэтому такой индекс сначала удаляем.
+    """
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
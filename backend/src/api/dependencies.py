@@ -1,24 +1,24 @@
 # backend/src/api/dependencies.py
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Annotated
+from typing import Annotated, Optional
 from uuid import UUID
 
-from src.database.connection import get_db
+from src.database.connection import AsyncSessionLocal, get_db
+from src.database.replicas import LAST_WRITE_COOKIE, LAST_WRITE_HEADER, read_session
 from src.utils.security import verify_token  
-from src.queries.users import get_user_by_id
+from src.utils.auth_cache import user_status_cache, USER_BLOCKED, USER_MISSING
+from src.queries import Repository
 
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[AsyncSession, Depends(get_db)]
-) -> UUID:
+async def authenticate_token(token: str, db: AsyncSession) -> UUID:
     """
-    Возвращает UUID текущего авторизованного пользователя.
+    Проверяет токен и статус пользователя, возвращает его UUID.
+    Статус пользователя берётся из кеша, в БД идём только при промахе.
     """
-    user_id_str = verify_token(credentials.credentials)
+    user_id_str = verify_token(token)
     if not user_id_str:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -34,18 +34,72 @@ async def get_current_user(
             detail="Invalid user ID in token"
         )
     
-    user = await get_user_by_id(db, user_id)
-    if not user:
+    user_status = user_status_cache.get(user_id)
+    if user_status is None:
+        user_status = await Repository(db).users.get_auth_status(user_id)
+        user_status_cache.set(user_id, user_status)
+
+    if user_status == USER_MISSING:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if user_status == USER_BLOCKED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is blocked",
+        )
     
     return user_id
 
 
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_db)]
+) -> UUID:
+    """
+    Возвращает UUID текущего авторизованного пользователя.
+    """
+    user_id = await authenticate_token(credentials.credentials, db)
+    # Коммиты этой сессии — записи пользователя (read-your-writes для реплик)
+    db.info["user_id"] = user_id
+    return user_id
+
+
+def _token_user_id(request: Request) -> Optional[UUID]:
+    """UUID из Bearer-токена без обращения к БД (только для выбора реплики)"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    user_id = verify_token(token)
+    try:
+        return UUID(user_id) if user_id else None
+    except ValueError:
+        return None
+
+
+def _client_last_write(request: Request) -> Optional[float]:
+    """Метка последней записи клиента (из любого воркера): заголовок или cookie"""
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+async def get_read_db(request: Request):
+    """
+    Сессия для эндпоинтов только на чтение: реплика, если она не отстаёт и уже видит
+    последние записи пользователя, иначе primary. Писать через эту сессию нельзя.
+    """
+    session = read_session(_token_user_id(request), _client_last_write(request)) or AsyncSessionLocal()
+    async with session:
+        yield session
+
+
 DatabaseDep = Annotated[AsyncSession, Depends(get_db)]
+ReadDatabaseDep = Annotated[AsyncSession, Depends(get_read_db)]
 CurrentUser = Annotated[UUID, Depends(get_current_user)]
 
 # DatabaseDep = Depends(get_db)
@@ -0,0 +1,72 @@
+# src/api/loader.py
+import asyncio
+import importlib
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+# (модуль в src.api.routes, префикс, тег)
+API_ROUTERS: List[Tuple[str, str, str]] = [
+    ("auth", "/api/auth", "Auth"),
+    ("users", "/api/users", "Users"),
+    ("items", "/api/items", "Items"),
+    ("chats", "/api/chats", "Chats"),
+    ("categories", "/api/categories", "Categories"),
+    ("review", "/api/review", "Review"),
+    ("rentals", "/api/rentals", "Rentals"),
+]
+
+
+class RouterLoader:
+    """
+    Роутеры API (а с ними модели, слой запросов, pydantic-схемы) импортируются
+    не при импорте приложения, а в фоне после старта: /health отвечает сразу.
+    Импорт идёт в потоке, include_router — в event loop.
+    """
+
+    def __init__(self, app: FastAPI, routers: List[Tuple[str, str, str]] = API_ROUTERS):
+        self.app = app
+        self.routers = routers
+        self.loaded = False
+        self.load_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._load())
+        return self._task
+
+    async def wait(self) -> None:
+        if not self.loaded:
+            await asyncio.shield(self.start())
+
+    def load_now(self) -> None:
+        """Синхронная загрузка (LAZY_ROUTERS=False, генерация схемы OpenAPI из скриптов)"""
+        if not self.loaded:
+            self._include(self._import_modules())
+
+    async def _load(self) -> None:
+        started = time.perf_counter()
+        try:
+            modules = await asyncio.to_thread(self._import_modules)
+        except Exception:
+            logger.exception("Failed to import API routers")
+            raise
+        if not self.loaded:
+            self._include(modules)
+        self.load_seconds = time.perf_counter() - started
+        logger.info("API routers loaded in %.0f ms", self.load_seconds * 1000)
+
+    def _import_modules(self) -> list:
+        return [importlib.import_module(f"src.api.routes.{name}") for name, _, _ in self.routers]
+
+    def _include(self, modules: list) -> None:
+        for module, (_, prefix, tag) in zip(modules, self.routers):
+            self.app.include_router(module.router, prefix=prefix, tags=[tag])
+        # Схема могла быть закеширована до загрузки роутеров
+        self.app.openapi_schema = None
+        self.loaded = True
@@ -3,10 +3,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from src.api.dependencies import DatabaseDep
+from src.database.unit_of_work import commit
 from src.models.auth import UserRegister, UserLogin, Token
 from src.models.user import User, UserAuth
 from src.queries import Repository
-from src.utils.security import get_password_hash, verify_password, create_access_token
+from src.utils.security import get_password_hash_async, verify_password_async, create_access_token
 
 router = APIRouter()
 
@@ -30,10 +31,11 @@ async def register(user: UserRegister, db: DatabaseDep):
         "phone": user.phone,
     }
     auth_data = {
-    "password_hash": get_password_hash(user.password)
+    "password_hash": await get_password_hash_async(user.password)
     }
 
     db_user = await repo.users.create_with_auth(user_data, auth_data)
+    await commit(db)
 
     # Создаём токен
     access_token = create_access_token(data={"sub": str(db_user.id)})
@@ -55,7 +57,7 @@ async def login(credentials: UserLogin, db: DatabaseDep):
     result = await db.execute(select(UserAuth).where(UserAuth.user_id == user.id))
     user_auth = result.scalar_one_or_none()
 
-    if not user_auth or not verify_password(credentials.password, user_auth.password_hash):
+    if not user_auth or not await verify_password_async(credentials.password, user_auth.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid cREdentials",
@@ -1,14 +1,32 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dependencies import DatabaseDep  
 from src.queries import Repository               
+from src.queries.categories import category_tree_cache
 from src.models.category import Category
 
 router = APIRouter()
 
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag == etag or tag == f"W/{etag}" for tag in candidates)
+
+
 @router.get("/")
-async def list_categories(db: DatabaseDep):  
-    repo = Repository(db)
-    categories = await repo.categories.get_all_with_children()
-    return categories
\ No newline at end of file
+async def list_categories(request: Request, db: DatabaseDep):  
+    """
+    Дерево категорий (готовый JSON из кеша) с поддержкой ETag / 304.
+    Кеш пересобирается из primary: дерево с отстающей реплики прожило бы весь TTL
+    """
+    body, etag = await category_tree_cache.get(db)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
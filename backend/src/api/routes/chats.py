@@ -1,26 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from typing import Optional
 from uuid import UUID
 
-from src.api.dependencies import DatabaseDep, CurrentUser  
+from src.api.dependencies import DatabaseDep, ReadDatabaseDep, CurrentUser, authenticate_token
+from src.config import settings
+from src.database.connection import AsyncSessionLocal
+from src.database.unit_of_work import commit
 from src.queries import Repository
+from src.queries.chats import ConversationResponse, InboxPage, get_inbox, get_user_conversations as list_user_conversations
 from src.models.item import Item
 from src.models.conversation import ConversationParticipant
-from ..dependencies import get_db
+from src.realtime.broker import get_broker
+from src.realtime.connections import ClientConnection
+from src.realtime.events import user_channel
+from ..dependencies import get_db, get_read_db
 
 router = APIRouter()
 
 
-@router.get("/")
+@router.get("/", response_model=list[ConversationResponse])
 async def get_user_conversations(
     current_user: CurrentUser, 
-    db: DatabaseDep
+    db: ReadDatabaseDep
 ):
     """Получить все беседы текущего пользователя"""
-    repo = Repository(db)
-    convs = await repo.conversations.get_user_conversations(current_user)
-    return convs
+    return await list_user_conversations(db, current_user)
+
+
+@router.get("/inbox", response_model=InboxPage)
+async def get_user_inbox(
+    current_user: CurrentUser,
+    limit: int = Query(30, ge=1, le=100),
+    before: Optional[UUID] = Query(None, description="next_cursor предыдущей страницы"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Список бесед с последним сообщением и числом непрочитанных, свежие первыми"""
+    return await get_inbox(db, current_user, limit=limit, before=before)
 
 
 @router.post("/start")
@@ -41,6 +59,7 @@ async def start_conversation(
     
     user_ids = [current_user, item.owner_id]
     conv = await repo.conversations.get_or_create_conversation(item_id, user_ids)
+    await commit(db)
     return conv
 
 
@@ -48,10 +67,19 @@ async def start_conversation(
 async def get_messages(
     conversation_id: UUID,
     current_user: CurrentUser,
+    limit: int = Query(50, ge=1, le=200),
+    before: Optional[UUID] = Query(None, description="id сообщения: вернуть более старые"),
+    after: Optional[UUID] = Query(None, description="id сообщения: вернуть более новые"),
     # db: DatabaseDep
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Получить сообщения в беседе (только если пользователь — участник)"""
+    """
+    Получить сообщения в беседе (только если пользователь — участник).
+    По умолчанию — последние limit сообщений, в хронологическом порядке.
+    """
+    if before is not None and after is not None:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Use either before or after, not both")
+
     repo = Repository(db)
     
     # participant = await repo.session.execute(
@@ -67,10 +95,28 @@ async def get_messages(
     if not await repo.conversations.is_participant(conversation_id, current_user):
         raise HTTPException(status.HTTP_403_FORBIDDEN, "You are not a participant...")
     
-    messages = await repo.messages.get_messages_in_conversation(conversation_id)
+    messages = await repo.messages.get_messages_in_conversation(
+        conversation_id, limit=limit, before=before, after=after
+    )
     return messages
 
 
+@router.post("/{conversation_id}/read")
+async def mark_conversation_read(
+    conversation_id: UUID,
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(get_db)
+):
+    """Отметить беседу прочитанной для текущего пользователя"""
+    repo = Repository(db)
+    if not await repo.conversations.is_participant(conversation_id, current_user):
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "You are not a participant...")
+
+    await repo.conversations.mark_read(conversation_id, current_user)
+    await commit(db)
+    return {"conversation_id": conversation_id, "unread_count": 0}
+
+
 @router.post("/{conversation_id}/messages")
 async def send_message(
     conversation_id: UUID,
@@ -93,4 +139,36 @@ async def send_message(
         raise HTTPException(status.HTTP_403_FORBIDDEN, "You cannot send messages to this conversation")
     
     msg = await repo.messages.create_message(conversation_id, current_user, text)
-    return msg
\ No newline at end of file
+    await commit(db)
+    return msg
+
+
+@router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket, token: str = Query(...)):
+    """
+    Поток новых сообщений во всех беседах пользователя.
+    Токен передаётся в query, так как браузер не умеет ставить заголовки для WebSocket.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            user_id = await authenticate_token(token, db)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+    await websocket.accept()
+    connection = ClientConnection(websocket, settings.WS_SEND_QUEUE_SIZE)
+    channel = user_channel(user_id)
+    broker = get_broker()
+    broker.subscribe(channel, connection.deliver)
+    sender = asyncio.create_task(connection.run_sender())
+    try:
+        while True:
+            text = await websocket.receive_text()
+            if text == "ping":
+                connection.deliver("pong")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        broker.unsubscribe(channel, connection.deliver)
+        sender.cancel()
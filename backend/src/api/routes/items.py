@@ -1,34 +1,93 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
 from uuid import UUID
 
 from src.api.dependencies import DatabaseDep  
 from src.queries import Repository  
+from src.queries.orm import ItemSearchFilters
 from src.models.item import Item
-from src.queries.items import ItemResponse
-from ..dependencies import get_db
+from src.queries.items import ItemResponse, ItemSearchPage, search_items_near
+from src.queries.rentals import ItemAvailability, get_item_availability, as_utc
+from ..dependencies import get_db, get_read_db
 #from src.database.connection import get_db
 
 router = APIRouter()
 
+# Максимальная длина окна календаря доступности
+MAX_AVAILABILITY_WINDOW = timedelta(days=366)
 
-@router.get("/")
+
+@router.get("/", response_model=ItemSearchPage)
 async def search_items(
     lat: float = Query(..., ge=-90, le=90),
     lon: float = Query(..., ge=-180, le=180),
     radius: float = Query(5.0, ge=0.1, le=100),
-    db: AsyncSession = Depends(get_db)
+    limit: int = Query(50, ge=1, le=200),
+    after: Optional[UUID] = Query(None, description="next_cursor предыдущей страницы"),
+    starts_at: Optional[datetime] = Query(None, description="Свободен с (вместе с ends_at)"),
+    ends_at: Optional[datetime] = Query(None, description="Свободен до (вместе с starts_at)"),
+    category_id: Optional[UUID] = Query(None, description="Категория вместе со всеми подкатегориями"),
+    min_price_per_day: Optional[float] = Query(None, ge=0),
+    max_price_per_day: Optional[float] = Query(None, ge=0),
+    min_price_per_hour: Optional[float] = Query(None, ge=0),
+    max_price_per_hour: Optional[float] = Query(None, ge=0),
+    q: Optional[str] = Query(None, min_length=1, max_length=200, description="Поиск по названию и описанию"),
+    sort: Literal["distance", "price", "newest"] = Query("distance"),
+    db: AsyncSession = Depends(get_read_db)
     # db: AsyncSession = Depends(DatabaseDep) конфликт при генерации API-схемы
 ):
-    repo = Repository(db)
-    items = await repo.items.get_available_items_near(lat, lon, radius)
-    return items
+    """Поиск доступных предметов рядом с фильтрами и фасетами по категориям"""
+    if (starts_at is None) != (ends_at is None):
+        raise HTTPException(status_code=400, detail="starts_at and ends_at must be given together")
+    if starts_at is not None:
+        starts_at, ends_at = as_utc(starts_at), as_utc(ends_at)
+        if ends_at <= starts_at:
+            raise HTTPException(status_code=400, detail="ends_at must be after starts_at")
+
+    filters = ItemSearchFilters(
+        lat=lat,
+        lon=lon,
+        radius_km=radius,
+        starts_at=starts_at,
+        ends_at=ends_at,
+        category_id=category_id,
+        min_price_per_day=min_price_per_day,
+        max_price_per_day=max_price_per_day,
+        min_price_per_hour=min_price_per_hour,
+        max_price_per_hour=max_price_per_hour,
+        q=q,
+        sort=sort,
+    )
+    return await search_items_near(db, filters, limit=limit, after=after)
 
 
 @router.get("/{item_id}")
-async def get_item(item_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_item(item_id: UUID, db: AsyncSession = Depends(get_read_db)):
     repo = Repository(db)
     item = await repo.items.get_by_id(Item, item_id) 
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    return item
\ No newline at end of file
+    return item
+
+
+@router.get("/{item_id}/availability", response_model=ItemAvailability)
+async def get_availability(
+    item_id: UUID,
+    starts_at: Optional[datetime] = Query(None, description="Начало окна, по умолчанию сейчас"),
+    ends_at: Optional[datetime] = Query(None, description="Конец окна, по умолчанию +30 дней"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Занятые и свободные интервалы предмета в заданном окне"""
+    starts_at = as_utc(starts_at) if starts_at else datetime.now(timezone.utc)
+    ends_at = as_utc(ends_at) if ends_at else starts_at + timedelta(days=30)
+    if ends_at <= starts_at:
+        raise HTTPException(status_code=400, detail="ends_at must be after starts_at")
+    if ends_at - starts_at > MAX_AVAILABILITY_WINDOW:
+        raise HTTPException(status_code=400, detail="Availability window is too long")
+
+    try:
+        return await get_item_availability(db, item_id, starts_at, ends_at)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from ..dependencies import get_db
+from ..dependencies import get_db, get_read_db
+from src.database.unit_of_work import commit
 
 from src.api.dependencies import DatabaseDep, CurrentUser
 from src.queries.rentals import (
@@ -9,7 +10,8 @@ from src.queries.rentals import (
     get_user_rentals, 
     confirm_rental,
     RentalCreate, 
-    RentalResponse
+    RentalResponse,
+    RentalConflict
 )
 
 router = APIRouter()
@@ -24,18 +26,26 @@ async def create_new_rental(
     try:
         # Устанавка арендатора как текущего пользователя
         rental.tenant_id = current_user
-        return await create_rental(db, rental)
+        created = await create_rental(db, rental)
+    except RentalConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    await commit(db)
+    return created
 
 @router.get("/me", response_model=list[RentalResponse])
-async def get_my_rentals(current_user: CurrentUser, db: AsyncSession = Depends(get_db)):
+async def get_my_rentals(current_user: CurrentUser, db: AsyncSession = Depends(get_read_db)):
     """Получить все мои аренды (как арендатор или владелец)"""
     return await get_user_rentals(db, current_user)
 
 @router.post("/{rental_id}/confirm", response_model=RentalResponse)
 async def confirm_rental_endpoint(rental_id: UUID, current_user: CurrentUser, db: AsyncSession = Depends(get_db)):
     try:
-        return await confirm_rental(db, rental_id, current_user)
+        confirmed = await confirm_rental(db, rental_id, current_user)
+    except RentalConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+    await commit(db)
+    return confirmed
\ No newline at end of file
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from uuid import UUID
 
 from src.api.dependencies import DatabaseDep, CurrentUser
 from src.queries.reviews import create_review, get_reviews_for_user, ReviewCreate, ReviewResponse
-from ..dependencies import get_db
+from ..dependencies import get_db, get_read_db
+from src.database.unit_of_work import commit
 
 router = APIRouter()
 
@@ -16,11 +18,18 @@ async def create_user_review(
 ):
     """Создать отзыв на пользователя (после аренды)"""
     try:
-        return await create_review(db, current_user, review)
+        created = await create_review(db, current_user, review)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    await commit(db)
+    return created
 
 @router.get("/{user_id}", response_model=list[ReviewResponse])
-async def get_user_reviews(user_id: UUID, db: AsyncSession = Depends(get_db)):
-    """Получить все отзывы о пользователе"""
-    return await get_reviews_for_user(db, user_id)
\ No newline at end of file
+async def get_user_reviews(
+    user_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[UUID] = Query(None, description="id последнего отзыва предыдущей страницы"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Получить отзывы о пользователе, новые первыми"""
+    return await get_reviews_for_user(db, user_id, limit=limit, before=before)
\ No newline at end of file
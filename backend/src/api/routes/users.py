@@ -1,32 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from uuid import UUID
-from ..dependencies import get_db
+from ..dependencies import get_db, get_read_db
 from src.queries.orm import Repository
 from src.models.user import User
 from src.api.dependencies import CurrentUser, DatabaseDep
-from src.queries.items import ItemCreate, create_item
+from src.database.unit_of_work import commit
+from src.queries.items import ItemCreate, OwnerItemResponse, create_item, get_owner_items
+from src.queries.users import UserProfileResponse, get_user_profile
 
 router = APIRouter()
 
-@router.get("/{user_id}")
-async def get_user(user_id: UUID, db: AsyncSession = Depends(get_db)):
-    repo = Repository(db)
-    user = await repo.users.get_by_id(User, user_id)
+@router.get("/{user_id}", response_model=UserProfileResponse)
+async def get_user(user_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    user = await get_user_profile(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
-@router.get("/{user_id}/items")
-async def get_user_items(user_id: UUID, db: AsyncSession = Depends(get_db)):
-    repo = Repository(db)
-    items = await repo.items.get_by_owner(user_id)
-    return items
+@router.get("/{user_id}/items", response_model=list[OwnerItemResponse])
+async def get_user_items(user_id: UUID, db: AsyncSession = Depends(get_read_db)):
+    return await get_owner_items(db, user_id)
 
 @router.get("/{user_id}/reviews")
-async def get_user_reviews(user_id: UUID, db: AsyncSession = Depends(get_db)):
+async def get_user_reviews(
+    user_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[UUID] = Query(None, description="id последнего отзыва предыдущей страницы"),
+    db: AsyncSession = Depends(get_read_db)
+):
     repo = Repository(db)
-    reviews = await repo.reviews.get_reviews_about_user(user_id)
+    reviews = await repo.reviews.get_reviews_about_user(user_id, limit=limit, before=before)
     return reviews
 
 @router.post("/items")
@@ -37,4 +42,5 @@ async def create_user_item(
 ):
     item_data.owner_id = current_user
     item = await create_item(db, item_data)
+    await commit(db)
     return item
\ No newline at end of file
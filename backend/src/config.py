@@ -1,10 +1,8 @@
 # backend/config.py
 import os
-from dotenv import load_dotenv
+from typing import List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv(dotenv_path=os.path.join('backend', '.env'))
-
 class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int
@@ -16,11 +14,74 @@ class Settings(BaseSettings):
     def DATABASE_URL_asyncpg(self):
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def DATABASE_URL_dsn(self):
+        # Для прямых asyncpg-соединений вне SQLAlchemy (LISTEN/NOTIFY)
+        return f"postgresql://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    # Пул соединений
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 300
+    # Проверка соединения лишним запросом при каждой выдаче из пула
+    DB_POOL_PRE_PING: bool = False
+    # Кеш prepared statements asyncpg на одно соединение
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Реплики для чтения: "host" или "host:port", пользователь/пароль/БД — как у primary.
+    # Реплика с отставанием больше DB_REPLICA_MAX_LAG_SECONDS или без потоковой репликации
+    # не используется; проверке нужна роль pg_monitor (статус walreceiver)
+    DB_REPLICA_HOSTS: List[str] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+
     # JWT
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # bcrypt: размер пула потоков и длина очереди, сверх которой отвечаем 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Кеш статуса пользователя при аутентификации (секунды / записей)
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # Сколько проверенных JWT держать в LRU-кеше
+    TOKEN_CACHE_SIZE: int = 10000
     
+    # Схема БД при старте: "verify" — только сверить версию миграций (быстро, для прод),
+    # "create_all" — создать недостающие таблицы (локальная разработка), "off" — ничего
+    DB_SCHEMA_MODE: str = "verify"
+
+    # Readiness (/health/ready): фоновая проверка БД раз в интервал, результат кешируется;
+    # пул считается насыщенным при такой доле занятых соединений (с учётом overflow)
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 2.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 1.0
+    HEALTH_POOL_SATURATION_THRESHOLD: float = 0.9
+
+    # Роутеры API импортируются в фоне после старта, /health доступен сразу
+    LAZY_ROUTERS: bool = True
+
+    # Дерево категорий кешируется в процессе; TTL страхует от изменений из других воркеров
+    CATEGORY_CACHE_TTL_SECONDS: int = 300
+
+    # Чат в реальном времени: "memory" — один процесс, "postgres" — LISTEN/NOTIFY между воркерами
+    CHAT_BROKER: str = "memory"
+    # Сколько событий может ждать отправки одному WebSocket-клиенту
+    WS_SEND_QUEUE_SIZE: int = 100
+
+    # Метрики запросов (/metrics и заголовок Server-Timing); выключены — никаких хуков
+    METRICS_ENABLED: bool = True
+    # Server-Timing раскрывает клиенту время в БД и ожидание пула — только для отладки
+    # (включается и вместе с QUERY_DEBUG)
+    METRICS_SERVER_TIMING: bool = False
+
+    # Отладка запросов: X-Query-Count и предупреждения о повторяющихся запросах (N+1)
+    QUERY_DEBUG: bool = False
+    QUERY_DEBUG_REPEAT_THRESHOLD: int = 3
+
     # CORS
     ALLOWED_ORIGINS: list = [
         "http://localhost:3000",
@@ -28,7 +89,15 @@ class Settings(BaseSettings):
         "http://localhost:8000",
         "http://127.0.0.1:8000",
     ]
+    CORS_ALLOW_METHODS: list = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+    CORS_ALLOW_HEADERS: list = ["*"]
+    CORS_EXPOSE_HEADERS: list = ["*"]
+    CORS_ALLOW_CREDENTIALS: bool = False
+    # Сколько секунд браузер может не повторять preflight
+    CORS_MAX_AGE: int = 600
 
-    model_config = SettingsConfigDict(env_file=".env")
+    # .env читает сам pydantic-settings, без load_dotenv в os.environ;
+    # backend/.env — для запуска из корня репозитория, он важнее
+    model_config = SettingsConfigDict(env_file=(".env", os.path.join("backend", ".env")))
 
 settings = Settings()
\ No newline at end of file
@@ -1,16 +1,22 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from src.config import settings
+from src.database.pool import InstrumentedAsyncQueuePool, pool_status
 
 class Base(DeclarativeBase):
     pass
 
 engine = create_async_engine(
     settings.DATABASE_URL_asyncpg,
-    echo=True,
+    echo=settings.DB_ECHO,
     future=True,
-    pool_pre_ping=True,
-    pool_recycle=300
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -28,7 +34,13 @@ async def get_db():
         finally:
             await session.close()
 
+def get_pool_status() -> dict:
+    """Состояние пула соединений основного engine"""
+    return pool_status(engine.sync_engine.pool, settings.DB_MAX_OVERFLOW)
+
 async def create_tables():
     """Создание таблиц в БД"""
+    import src.models  # noqa: F401  модели импортируются лениво вместе с роутерами
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
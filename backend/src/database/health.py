@@ -0,0 +1,144 @@
+# src/database/health.py
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.config import settings
+from src.database.connection import get_pool_status
+from src.database.replicas import ReplicaRouter, replica_router
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseProbe:
+    """
+    Фоновая проверка БД для readiness: раз в interval секунд SELECT 1 через отдельный
+    engine на одно соединение (не стоит в очереди к основному пулу) и снимок загрузки
+    основного пула. Эндпоинты отдают закешированный результат и БД не трогают.
+    Заодно проверяется отставание реплик: по нему ReplicaRouter решает, куда слать чтение.
+    Недоступная реплика не делает воркер неготовым — чтение уходит в primary.
+    """
+
+    def __init__(
+        self,
+        pool_status: Callable[[], Dict[str, Any]],
+        interval: float,
+        timeout: float,
+        saturation_threshold: float,
+        replicas: Optional[ReplicaRouter] = None,
+    ):
+        self.pool_status = pool_status
+        self.interval = interval
+        self.timeout = timeout
+        self.saturation_threshold = saturation_threshold
+        self.replicas = replicas
+        self._engine: Optional[AsyncEngine] = None
+        self._task: Optional[asyncio.Task] = None
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at: Optional[float] = None
+        self._last_timeouts = 0
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._engine = create_async_engine(
+            settings.DATABASE_URL_asyncpg,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=self.timeout,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            connect_args={"timeout": self.timeout},
+        )
+        # Первая проверка до старта приёма трафика, дальше — в фоне
+        await self.check()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+        if self.replicas is not None:
+            await self.replicas.dispose()
+        self._result = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Database health probe failed")
+
+    async def check(self) -> Dict[str, Any]:
+        if self.replicas is not None and self.replicas.enabled:
+            database, replicas = await asyncio.gather(self._ping(), self.replicas.check(self.timeout))
+        else:
+            database, replicas = await self._ping(), None
+        pool = self._pool_check()
+        self._result = {
+            "ready": database["ok"] and not pool["saturated"],
+            "database": database,
+            "pool": pool,
+        }
+        if replicas is not None:
+            self._result["replicas"] = replicas
+        self._checked_at = time.monotonic()
+        return self._result
+
+    async def _ping(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self._engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            # Битое соединение не должно переиспользоваться следующей проверкой
+            await self._engine.dispose()
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+    def _pool_check(self) -> Dict[str, Any]:
+        status = self.pool_status()
+        capacity = status["pool_size"] + status["max_overflow"]
+        utilization = status["checked_out"] / capacity if capacity else 1.0
+        # Таймауты выдачи соединений с прошлой проверки — пул уже исчерпан
+        new_timeouts = status["timeouts"] - self._last_timeouts
+        self._last_timeouts = status["timeouts"]
+        return {
+            "saturated": utilization >= self.saturation_threshold or new_timeouts > 0,
+            "utilization": round(utilization, 3),
+            "checked_out": status["checked_out"],
+            "capacity": capacity,
+            "timeouts_since_last_check": new_timeouts,
+        }
+
+    def result(self) -> Dict[str, Any]:
+        """Последний результат; устаревший (фоновая проверка зависла) считается неготовностью"""
+        if self._result is None:
+            return {"ready": False, "error": "probe not started"}
+        age = time.monotonic() - self._checked_at
+        result = {**self._result, "age_seconds": round(age, 3)}
+        if age > self.interval * 3 + self.timeout:
+            result["ready"] = False
+            result["error"] = "probe result is stale"
+        return result
+
+
+database_probe = DatabaseProbe(
+    pool_status=get_pool_status,
+    interval=settings.HEALTH_PROBE_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+    saturation_threshold=settings.HEALTH_POOL_SATURATION_THRESHOLD,
+    replicas=replica_router,
+)
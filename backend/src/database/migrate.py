@@ -0,0 +1,126 @@
+# src/database/migrate.py
+"""
+Миграции схемы (Alembic) и проверка версии схемы при старте.
+
+    python -m src.database.migrate upgrade [head]
+    python -m src.database.migrate downgrade <revision>
+    python -m src.database.migrate current
+    python -m src.database.migrate stamp <revision>
+    python -m src.database.migrate revision -m "add something" [--autogenerate]
+
+БД, созданная раньше через create_all, соответствует ревизии 0001:
+выполните `stamp 0001`, затем `upgrade`.
+"""
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+
+from src.config import settings
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+SCHEMA_MODE_VERIFY = "verify"
+SCHEMA_MODE_CREATE_ALL = "create_all"
+SCHEMA_MODE_OFF = "off"
+
+
+class SchemaOutOfDate(RuntimeError):
+    """Версия схемы в БД не совпадает с последней миграцией"""
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    return Config(str(ALEMBIC_INI))
+
+
+def head_revision() -> Optional[str]:
+    """Последняя ревизия по файлам миграций (без подключения к БД)"""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def current_revision() -> Optional[str]:
+    """Ревизия из alembic_version; None, если миграции не применялись"""
+    from src.database.connection import engine
+
+    async with engine.connect() as conn:
+        exists = await conn.scalar(text("SELECT to_regclass('alembic_version') IS NOT NULL"))
+        if not exists:
+            return None
+        return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+
+
+async def verify_schema() -> str:
+    """Один запрос вместо reflect/create_all: схема должна быть на последней миграции"""
+    head = head_revision()
+    current = await current_revision()
+    if current != head:
+        raise SchemaOutOfDate(
+            f"Database schema is at {current or 'no revision'}, expected {head}. "
+            f"Run `python -m src.database.migrate upgrade`."
+        )
+    return current
+
+
+async def prepare_schema() -> None:
+    """Подготовка схемы при старте приложения согласно DB_SCHEMA_MODE"""
+    mode = settings.DB_SCHEMA_MODE
+    if mode == SCHEMA_MODE_VERIFY:
+        revision = await verify_schema()
+        print(f"✅ Database schema at revision {revision}")
+    elif mode == SCHEMA_MODE_CREATE_ALL:
+        from src.database.connection import create_tables
+
+        await create_tables()
+        print("✅ Database tables created")
+    elif mode != SCHEMA_MODE_OFF:
+        raise ValueError(f"Unknown DB_SCHEMA_MODE: {mode}")
+
+
+def main(argv=None) -> None:
+    from alembic import command
+
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    upgrade = sub.add_parser("upgrade", help="apply migrations")
+    upgrade.add_argument("revision", nargs="?", default="head")
+    upgrade.add_argument("--sql", action="store_true", help="print SQL instead of running it")
+
+    downgrade = sub.add_parser("downgrade", help="revert migrations")
+    downgrade.add_argument("revision")
+    downgrade.add_argument("--sql", action="store_true", help="print SQL instead of running it")
+
+    sub.add_parser("current", help="show the database revision")
+    sub.add_parser("history", help="list migrations")
+
+    stamp = sub.add_parser("stamp", help="set the database revision without running migrations")
+    stamp.add_argument("revision")
+
+    revision = sub.add_parser("revision", help="create a new migration file")
+    revision.add_argument("-m", "--message", required=True)
+    revision.add_argument("--autogenerate", action="store_true")
+
+    args = parser.parse_args(argv)
+    config = alembic_config()
+
+    if args.command == "upgrade":
+        command.upgrade(config, args.revision, sql=args.sql)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision, sql=args.sql)
+    elif args.command == "current":
+        command.current(config, verbose=True)
+    elif args.command == "history":
+        command.history(config)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "revision":
+        command.revision(config, message=args.message, autogenerate=args.autogenerate)
+
+
+if __name__ == "__main__":
+    main()
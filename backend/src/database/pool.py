@@ -0,0 +1,63 @@
+# src/database/pool.py
+import time
+from typing import Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.utils.metrics import record_pool_wait
+
+
+class PoolStats:
+    """Счётчики выдачи соединений из пула"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool, который меряет время ожидания соединения и считает таймауты.
+    Время ожидания включает установку нового соединения, если пул ушёл в overflow.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.record_wait(waited)
+            record_pool_wait(waited)
+
+
+def pool_status(pool: InstrumentedAsyncQueuePool, max_overflow: int) -> Dict[str, float]:
+    stats = pool.stats
+    checkouts = stats.checkouts or 1
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": stats.checkouts,
+        "timeouts": stats.timeouts,
+        "wait_ms_avg": round(stats.wait_seconds_total / checkouts * 1000, 3),
+        "wait_ms_max": round(stats.wait_seconds_max * 1000, 3),
+    }
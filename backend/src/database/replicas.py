@@ -0,0 +1,247 @@
+# src/database/replicas.py
+import asyncio
+import itertools
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.database.pool import InstrumentedAsyncQueuePool, pool_status
+
+# Отставание реплики: 0, если она применила всё полученное (в т.ч. когда «реплика» — сам primary).
+# Без потоковой репликации «всё полученное» может быть сколь угодно старым — тогда NULL.
+# Статус walreceiver виден роли с pg_read_all_stats (или pg_monitor)
+_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def _replica_url(host: str) -> str:
+    """host или host:port; пользователь, пароль и имя БД — как у primary"""
+    host, _, port = host.partition(":")
+    return (
+        f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASS}"
+        f"@{host}:{port or settings.DB_PORT}/{settings.DB_NAME}"
+    )
+
+
+class Replica:
+    """Реплика для чтения: рабочий engine и отдельное соединение для проверки отставания"""
+
+    def __init__(self, host: str):
+        self.host = host
+        url = _replica_url(host)
+        self.engine: AsyncEngine = create_async_engine(
+            url,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+        )
+        # Проверка не стоит в очереди к пулу вместе с запросами пользователей
+        self.probe_engine: AsyncEngine = create_async_engine(
+            url, pool_size=1, max_overflow=0, pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+        self.sessionmaker = async_sessionmaker(
+            self.engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+        )
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        # Время (time.time()) последней проверки: реплика содержит все коммиты до checked_at - lag
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    async def check(self, timeout: float) -> None:
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.probe_engine.connect() as conn:
+                    checked_at = time.time()
+                    lag = await conn.scalar(_LAG_SQL)
+        except Exception as exc:
+            await self.probe_engine.dispose()
+            self.healthy = False
+            self.error = f"{type(exc).__name__}: {exc}"
+            return
+        if lag is None:
+            self.healthy = False
+            self.error = "WAL receiver is not streaming"
+            return
+        self.healthy = True
+        self.lag_seconds = float(lag)
+        self.checked_at = checked_at
+        self.error = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "healthy": self.healthy,
+            "lag_seconds": None if self.lag_seconds is None else round(self.lag_seconds, 3),
+            "error": self.error,
+            "pool": pool_status(self.engine.sync_engine.pool, settings.DB_MAX_OVERFLOW),
+        }
+
+
+class ReplicaRouter:
+    """
+    Выбор реплики для чтения (по кругу среди пригодных). Реплика пригодна, если последняя
+    проверка свежая, отставание не больше max_lag и она уже содержит последнюю запись
+    пользователя (read-your-writes). Иначе чтение идёт в primary.
+    """
+
+    def __init__(self, hosts: List[str], max_lag: float, stale_after: float):
+        self.replicas = [Replica(host) for host in hosts]
+        self.max_lag = max_lag
+        self.stale_after = stale_after
+        self._next = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    @property
+    def write_window(self) -> float:
+        """Запись старше этого окна гарантированно видна на любой пригодной реплике"""
+        return self.max_lag + self.stale_after
+
+    def _usable(self, replica: Replica, now: float, last_write: Optional[float]) -> bool:
+        if not replica.healthy or now - replica.checked_at > self.stale_after:
+            return False
+        if replica.lag_seconds > self.max_lag:
+            return False
+        return last_write is None or last_write <= replica.checked_at - replica.lag_seconds
+
+    def choose(self, last_write: Optional[float] = None) -> Optional[Replica]:
+        now = time.time()
+        usable = [r for r in self.replicas if self._usable(r, now, last_write)]
+        if not usable:
+            return None
+        return usable[next(self._next) % len(usable)]
+
+    async def check(self, timeout: float) -> List[Dict[str, Any]]:
+        await asyncio.gather(*(replica.check(timeout) for replica in self.replicas))
+        return [replica.status() for replica in self.replicas]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+            await replica.probe_engine.dispose()
+
+
+class RecentWrites:
+    """
+    Когда пользователь последний раз что-то закоммитил (в этом процессе). Запросы,
+    попавшие в другой воркер, узнают о записи по метке клиента (LAST_WRITE_COOKIE)
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._writes: Dict[UUID, float] = {}
+        self._pruned_at = 0.0
+
+    def record(self, user_id: UUID) -> None:
+        now = time.time()
+        self._writes[user_id] = now
+        if now - self._pruned_at > self.window:
+            self._writes = {uid: at for uid, at in self._writes.items() if now - at <= self.window}
+            self._pruned_at = now
+
+    def last_write(self, user_id: Optional[UUID]) -> Optional[float]:
+        if user_id is None:
+            return None
+        at = self._writes.get(user_id)
+        if at is not None and time.time() - at > self.window:
+            return None
+        return at
+
+
+replica_router = ReplicaRouter(
+    settings.DB_REPLICA_HOSTS,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    stale_after=settings.HEALTH_PROBE_INTERVAL_SECONDS * 3 + settings.HEALTH_PROBE_TIMEOUT_SECONDS,
+)
+recent_writes = RecentWrites(window=replica_router.write_window)
+
+
+# Метка последней записи у клиента (time.time() коммита): cookie для браузера и заголовок
+# для остальных клиентов. Ставится ReadYourWritesMiddleware, читается в get_read_db
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "x-last-write"
+
+
+class RequestWrite:
+    """Время коммита с записью в текущем HTTP-запросе"""
+
+    __slots__ = ("at",)
+
+    def __init__(self):
+        self.at: Optional[float] = None
+
+
+_request_write: ContextVar[Optional[RequestWrite]] = ContextVar("request_write", default=None)
+
+
+def start_request_write() -> Tuple[RequestWrite, object]:
+    write = RequestWrite()
+    return write, _request_write.set(write)
+
+
+def finish_request_write(token) -> None:
+    _request_write.reset(token)
+
+
+def read_session(
+    user_id: Optional[UUID] = None, client_last_write: Optional[float] = None
+) -> Optional[AsyncSession]:
+    """
+    Сессия на пригодной реплике или None — тогда читать из primary. Последняя запись —
+    более поздняя из известной этому процессу и метки клиента
+    """
+    last_write = recent_writes.last_write(user_id)
+    if client_last_write is not None and (last_write is None or client_last_write > last_write):
+        last_write = client_last_write
+    replica = replica_router.choose(last_write)
+    return replica.sessionmaker() if replica is not None else None
+
+
+# Read-your-writes: сессия primary помечается пользователем (session.info["user_id"]
+# в get_current_user); коммит, в котором что-то писалось, запоминается для него.
+def _mark_write(session: Session, *args) -> None:
+    session.info["wrote"] = True
+
+
+def _mark_orm_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop("wrote", False):
+        user_id = session.info.get("user_id")
+        if user_id is not None:
+            recent_writes.record(user_id)
+        request_write = _request_write.get()
+        if request_write is not None:
+            request_write.at = time.time()
+
+
+def _after_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop("wrote", None)
+
+
+if replica_router.enabled:
+    event.listen(Session, "after_flush", _mark_write)
+    event.listen(Session, "do_orm_execute", _mark_orm_write)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
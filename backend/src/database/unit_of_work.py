@@ -0,0 +1,50 @@
+# src/database/unit_of_work.py
+"""
+Единица работы на запрос. Репозитории только добавляют/изменяют строки и делают flush
+(серверные значения приходят через RETURNING), транзакцию один раз коммитит эндпоинт:
+
+    msg = await repo.messages.create_message(...)
+    await commit(db)
+
+Побочные эффекты, которые должны случиться только после успешного коммита
+(рассылка в WebSocket, сброс кешей), регистрируются через on_commit.
+"""
+import inspect
+import logging
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_CALLBACKS_KEY = "on_commit"
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """Выполнить callback (обычную или async-функцию) после коммита; при откате — забыть"""
+    session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+
+async def commit(session: AsyncSession) -> None:
+    """Закоммитить транзакцию запроса и выполнить отложенные callback'и"""
+    try:
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    callbacks = session.info.pop(_CALLBACKS_KEY, [])
+    for callback in callbacks:
+        # Данные уже закоммичены: ошибка побочного эффекта не должна превращать ответ в 500
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            logger.exception("on_commit callback %r failed", callback)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_callbacks(session):
+    session.info.pop(_CALLBACKS_KEY, None)
@@ -1,54 +1,94 @@
 # backend/main.py
-from src.models.user import User
-from src.models.item import Item
-from src.models.conversation import Conversation
-from src.models.category import Category
 from fastapi.exceptions import RequestValidationError, ResponseValidationError
-from src.api.routes import auth, chats, items, users, categories, review, rentals
-from src.database.connection import create_tables
+from src.api.loader import RouterLoader
+from src.database.connection import engine, get_pool_status
+from src.database.health import database_probe
+from src.database.migrate import prepare_schema
+from src.database.replicas import replica_router
+from src.realtime.broker import start_broker, stop_broker
 from src.config import settings
+from src.middleware.cors import CORSMiddleware
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.query_debug import QueryDebugMiddleware
+from src.middleware.read_your_writes import ReadYourWritesMiddleware
+from src.middleware.router_gate import RouterGateMiddleware
+from src.utils.metrics import install_engine_hooks, metrics_registry
+from src.utils.query_log import install_query_log_hooks
+from src.utils.security import PasswordHasherBusy, password_hasher, token_cache
 from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
-import traceback
+import logging
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    await create_tables()
-    print("✅ Database tables created")
+    await prepare_schema()
+    await start_broker()
+    if settings.LAZY_ROUTERS:
+        router_loader.start()
+    await database_probe.start()
     yield
-    # Shutdown
+    # Shutdown: сначала readiness перестаёт отвечать 200
+    await database_probe.stop()
+    await stop_broker()
+    password_hasher.shutdown()
     print("🛑 Application shutdown")
 
 app = FastAPI(
     title="Rent System API",
     description="Backend for a peer-to-peer rental platform with chat",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson кодирует ответ сразу в bytes, без jsonable_encoder
+    default_response_class=ORJSONResponse,
 )
 
+# Роутеры API: в фоне после старта (LAZY_ROUTERS) или сразу при импорте
+router_loader = RouterLoader(app)
+if settings.LAZY_ROUTERS:
+    app.add_middleware(RouterGateMiddleware, loader=router_loader)
+else:
+    router_loader.load_now()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        # добавьте другие если нужно
-    ],
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
+    allow_origins=settings.ALLOWED_ORIGINS,
+    allow_methods=settings.CORS_ALLOW_METHODS,
+    allow_headers=settings.CORS_ALLOW_HEADERS,
+    expose_headers=settings.CORS_EXPOSE_HEADERS,
+    allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
+    max_age=settings.CORS_MAX_AGE,
 )
 
+# Основной engine и реплики для чтения
+engines = [engine] + [replica.engine for replica in replica_router.replicas]
+
+if replica_router.enabled:
+    app.add_middleware(ReadYourWritesMiddleware, max_age=replica_router.write_window)
+
+if settings.QUERY_DEBUG:
+    for db_engine in engines:
+        install_query_log_hooks(db_engine)
+    app.add_middleware(QueryDebugMiddleware, repeat_threshold=settings.QUERY_DEBUG_REPEAT_THRESHOLD)
+
+if settings.METRICS_ENABLED:
+    for db_engine in engines:
+        install_engine_hooks(db_engine)
+    app.add_middleware(
+        MetricsMiddleware,
+        registry=metrics_registry,
+        server_timing=settings.METRICS_SERVER_TIMING or settings.QUERY_DEBUG,
+    )
+
 # ========== EXCEPTION HANDLERS ==========
 @app.exception_handler(ResponseValidationError)
 async def response_validation_handler(request: Request, exc: ResponseValidationError):
     """Обработчик ошибок валидации ответа"""
-    print(f"ResponseValidationError: {exc}")
-    print(traceback.format_exc())
+    logger.error("ResponseValidationError on %s %s: %s", request.method, request.url.path, exc)
     
     return JSONResponse(
         status_code=200,  # Возвращаем 200 чтобы CORS заголовки работали
@@ -59,11 +99,23 @@ async def response_validation_handler(request: Request, exc: ResponseValidationE
         }
     )
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Пул bcrypt перегружен — быстро отказываем, клиент повторит запрос"""
+    return JSONResponse(
+        status_code=503,
+        content={
+            "success": False,
+            "error": "Сервер перегружен, повторите попытку",
+            "details": str(exc)
+        },
+        headers={"Retry-After": "1"}
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Глобальный обработчик исключений"""
-    print(f"Global exception: {exc}")
-    print(traceback.format_exc())
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
     
     return JSONResponse(
         status_code=500,
@@ -74,41 +126,72 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
-# ========== OPTIONS HANDLER FOR CORS PREFLIGHT ==========
-@app.middleware("http")
-async def add_cors_headers(request: Request, call_next):
-    # Обрабатываем OPTIONS (preflight) запросы
-    if request.method == "OPTIONS":
-        response = JSONResponse(content={"message": "OK"})
-    else:
-        response = await call_next(request)
-    
-    # Добавляем CORS заголовки ко всем ответам
-    response.headers["Access-Control-Allow-Origin"] = "*"
-    response.headers["Access-Control-Allow-Credentials"] = "true"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-    response.headers["Access-Control-Allow-Headers"] = "*"
-    response.headers["Access-Control-Expose-Headers"] = "*"
-    
-    return response
-
-# Include routers
-app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
-app.include_router(users.router, prefix="/api/users", tags=["Users"])
-app.include_router(items.router, prefix="/api/items", tags=["Items"])
-app.include_router(chats.router, prefix="/api/chats", tags=["Chats"])
-app.include_router(categories.router, prefix="/api/categories", tags=["Categories"])
-app.include_router(review.router, prefix="/api/review", tags=["Review"])
-app.include_router(rentals.router, prefix="/api/rentals", tags=["Rentals"])
-
 @app.get("/")
 async def root():
     return {"message": "Система ренты вещей API"} #правка
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "database": "connected"}
+    probe = database_probe.result()
+    return {
+        "status": "healthy" if probe["ready"] else "degraded",
+        "database": probe.get("database"),
+        "api_routers_loaded": router_loader.loaded,
+        "password_hasher": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+    }
+
+@app.get("/health/live")
+async def liveness():
+    """Процесс жив и event loop отвечает; БД не проверяется"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Готовность принимать трафик: закешированный результат фоновой проверки БД
+    и загрузки пула, плюс загруженные роутеры API. 503 — убрать воркер из балансировки.
+    """
+    probe = database_probe.result()
+    ready = probe["ready"] and router_loader.loaded
+    return ORJSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            **probe,
+            "ready": ready,
+            "status": "ready" if ready else "not_ready",
+            "api_routers_loaded": router_loader.loaded,
+        },
+    )
+
+@app.get("/health/pool")
+async def pool_health():
+    """Состояние пула соединений с БД: занятые, overflow, ожидание и таймауты"""
+    return get_pool_status()
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Метрики в текстовом формате Prometheus"""
+        return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rent System API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="print import-time breakdown and time to first request, then exit",
+    )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        from src.utils.startup_profile import report
+
+        report()
+    else:
+        import uvicorn
+
+        uvicorn.run(app, host=args.host, port=args.port)
\ No newline at end of file
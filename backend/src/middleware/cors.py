@@ -0,0 +1,121 @@
+# src/middleware/cors.py
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+class CORSMiddleware:
+    """
+    CORS на чистом ASGI: preflight отвечается сразу из заранее собранных заголовков,
+    к обычным ответам дописываются заголовки в http.response.start без копирования тела.
+    Запросы без Origin проходят без изменений.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Iterable[str],
+        allow_methods: Iterable[str] = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"),
+        allow_headers: Iterable[str] = ("*",),
+        expose_headers: Iterable[str] = (),
+        allow_credentials: bool = False,
+        max_age: int = 600,
+    ):
+        self.app = app
+        origins = list(allow_origins)
+        self.allow_all_origins = "*" in origins
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in origins)
+        # С credentials браузер не принимает "*", поэтому тогда отражаем Origin запроса
+        self.echo_origin = allow_credentials or not self.allow_all_origins
+
+        common: Headers = []
+        if allow_credentials:
+            common.append((b"access-control-allow-credentials", b"true"))
+        if not self.echo_origin:
+            common.append((b"access-control-allow-origin", b"*"))
+
+        headers = list(allow_headers)
+        # Браузеры не считают "*" разрешением для Authorization, поэтому при "*"
+        # отражаем Access-Control-Request-Headers из preflight
+        self.echo_request_headers = "*" in headers
+
+        self.preflight_headers: Headers = common + [
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"content-length", b"0"),
+        ]
+        if not self.echo_request_headers:
+            self.preflight_headers.append(
+                (b"access-control-allow-headers", ", ".join(headers).encode("latin-1"))
+            )
+        self.simple_headers: Headers = list(common)
+        expose = ", ".join(expose_headers)
+        if expose:
+            self.simple_headers.append((b"access-control-expose-headers", expose.encode("latin-1")))
+
+    def _is_allowed(self, origin: bytes) -> bool:
+        return self.allow_all_origins or origin in self.allow_origins
+
+    def _origin_headers(self, origin: bytes) -> Headers:
+        if self.echo_origin:
+            return [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+        return []
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(origin, request_headers, send)
+            return
+
+        if not self._is_allowed(origin):
+            await self.app(scope, receive, send)
+            return
+
+        extra_headers = self.simple_headers + self._origin_headers(origin)
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + extra_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, origin: bytes, request_headers: Optional[bytes], send: Send) -> None:
+        if self._is_allowed(origin):
+            status = 204
+            headers = list(self.preflight_headers)
+            vary = []
+            if self.echo_origin:
+                headers.append((b"access-control-allow-origin", origin))
+                vary.append(b"Origin")
+            if self.echo_request_headers:
+                if request_headers:
+                    headers.append((b"access-control-allow-headers", request_headers))
+                vary.append(b"Access-Control-Request-Headers")
+            if vary:
+                headers.append((b"vary", b", ".join(vary)))
+        else:
+            status = 400
+            headers = [(b"content-length", b"0")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
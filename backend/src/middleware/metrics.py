@@ -0,0 +1,62 @@
+# src/middleware/metrics.py
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import MetricsRegistry, finish_request_stats, start_request_stats
+
+# Запросы, не попавшие ни в один маршрут, сводим в одну метку, чтобы не плодить серии
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Метрики HTTP-запросов на чистом ASGI: латентность, число SQL-запросов и время в БД,
+    ожидание пула и размер ответа. Заголовок Server-Timing добавляется в http.response.start.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry, server_timing: bool = True):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats, token = start_request_stats()
+        status = 500
+        response_bytes = 0
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    timing = (
+                        f"total;dur={(time.perf_counter() - started) * 1000:.1f}, "
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_queries} queries", '
+                        f"pool;dur={stats.pool_wait_seconds * 1000:.1f}"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", timing.encode("latin-1"))
+                    ]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            finish_request_stats(token)
+            route = scope.get("route")
+            self.registry.observe_request(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status,
+                time.perf_counter() - started,
+                stats,
+                response_bytes,
+            )
@@ -0,0 +1,41 @@
+# src/middleware/query_debug.py
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.query_log import capture_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryDebugMiddleware:
+    """
+    Режим отладки запросов: считает SQL на каждый HTTP-запрос (заголовок X-Query-Count)
+    и пишет предупреждение, если запрос одной формы повторился repeat_threshold раз (N+1).
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 3):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with capture_queries(capture_origin=True) as log:
+
+            async def send_with_count(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-query-count", str(log.count).encode("latin-1"))
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
+
+        for shape, count, origin in log.repeated(self.repeat_threshold):
+            logger.warning(
+                "Possible N+1 on %s %s: %d x %s (from %s)",
+                scope["method"], scope["path"], count, shape, origin or "unknown",
+            )
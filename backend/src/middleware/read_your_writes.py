@@ -0,0 +1,44 @@
+# src/middleware/read_your_writes.py
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.replicas import (
+    LAST_WRITE_COOKIE,
+    LAST_WRITE_HEADER,
+    finish_request_write,
+    start_request_write,
+)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Если запрос что-то закоммитил в primary, ответ несёт время коммита (заголовок
+    X-Last-Write и cookie). Клиент присылает метку обратно, и любой воркер не отдаст
+    чтение реплике, которая этот коммит ещё не применила.
+    """
+
+    def __init__(self, app: ASGIApp, max_age: float):
+        self.app = app
+        # После окна любая пригодная реплика уже видит запись — метка не нужна
+        self.max_age = int(max_age) + 1
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        write, token = start_request_write()
+
+        async def send_with_marker(message: Message) -> None:
+            if message["type"] == "http.response.start" and write.at is not None:
+                value = f"{write.at:.6f}"
+                cookie = f"{LAST_WRITE_COOKIE}={value}; Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = list(message.get("headers", [])) + [
+                    (LAST_WRITE_HEADER.encode("latin-1"), value.encode("latin-1")),
+                    (b"set-cookie", cookie.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            finish_request_write(token)
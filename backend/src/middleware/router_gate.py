@@ -0,0 +1,27 @@
+# src/middleware/router_gate.py
+from typing import Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.api.loader import RouterLoader
+
+# Пути, которым нужны роутеры API; остальные (/health, /metrics, /) обслуживаются сразу
+GATED_PREFIXES: Tuple[str, ...] = ("/api", "/docs", "/redoc", "/openapi.json")
+
+
+class RouterGateMiddleware:
+    """Запросы к API ждут фоновую загрузку роутеров (и запускают её, если lifespan не выполнялся)"""
+
+    def __init__(self, app: ASGIApp, loader: RouterLoader, prefixes: Tuple[str, ...] = GATED_PREFIXES):
+        self.app = app
+        self.loader = loader
+        self.prefixes = prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not self.loader.loaded
+            and scope["type"] in ("http", "websocket")
+            and scope["path"].startswith(self.prefixes)
+        ):
+            await self.loader.wait()
+        await self.app(scope, receive, send)
@@ -11,5 +11,6 @@ class Category(Base):
     name = Column(String, nullable=False, index=True)
     parent_id = Column(PG_UUID(as_uuid=True), ForeignKey("categories.id", ondelete="SET NULL"), index=True)
 
-    children = relationship("Category", remote_side=[id])
+    parent = relationship("Category", remote_side=[id], back_populates="children")
+    children = relationship("Category", back_populates="parent")
     items = relationship("Item", back_populates="category")
\ No newline at end of file
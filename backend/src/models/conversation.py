@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy import Column, DateTime, ForeignKey, Boolean, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,20 +12,39 @@ class Conversation(Base):
     item_id = Column(PG_UUID(as_uuid=True), ForeignKey("items.id", ondelete="SET NULL"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Денормализация для списка бесед; обновляется вместе с созданием сообщения
+    last_message_id = Column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("messages.id", ondelete="SET NULL", use_alter=True, name="fk_conversations_last_message_id"),
+    )
+    last_message_at = Column(DateTime(timezone=True))
 
     # Связи
     item = relationship("Item", back_populates="conversations")
     participants = relationship("ConversationParticipant", back_populates="conversation", cascade="all, delete-orphan")
-    messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan")
+    messages = relationship(
+        "Message",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        foreign_keys="Message.conversation_id",
+    )
 
 
 class ConversationParticipant(Base):
     __tablename__ = "conversation_participants"
+    __table_args__ = (
+        # Inbox: WHERE user_id = ? ORDER BY last_message_at DESC, conversation_id DESC
+        Index("ix_participants_user_last_message", "user_id", "last_message_at", "conversation_id"),
+    )
 
     conversation_id = Column(PG_UUID(as_uuid=True), ForeignKey("conversations.id", ondelete="CASCADE"), primary_key=True)
     user_id = Column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True, index=True)
+    last_read_at = Column(DateTime(timezone=True))
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Копия conversations.last_message_at, чтобы inbox читался одним индексом
+    last_message_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     conversation = relationship("Conversation", back_populates="participants")
     user = relationship("User", back_populates="conversations")
\ No newline at end of file
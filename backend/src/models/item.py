@@ -1,12 +1,21 @@
-from sqlalchemy import Column, String, Text, Numeric, Boolean, DateTime, ForeignKey, Index, Integer
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Numeric, Boolean, DateTime, ForeignKey, Index, Integer, Computed, event, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from src.database.connection import Base
+from src.utils.geo import geohash_encode, GEOHASH_PRECISION
 import uuid
 
+# Конфигурация полнотекстового поиска: без стемминга, одинаково для русского и английского
+SEARCH_TS_CONFIG = "simple"
+
 class Item(Base):
     __tablename__ = "items"
+    __table_args__ = (
+        # Поиск по геохешу идёт только среди доступных предметов
+        Index("ix_items_available_geohash", "geohash", postgresql_where=text("is_available")),
+        Index("ix_items_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     owner_id = Column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -16,10 +25,20 @@ class Item(Base):
     price_per_hour = Column(Numeric(10, 2))
     price_per_day = Column(Numeric(10, 2))
     address = Column(String, nullable=False)
-    latitude = Column(Numeric(10, 7), index=True)
-    longitude = Column(Numeric(10, 7), index=True)
+    latitude = Column(Numeric(10, 7))
+    longitude = Column(Numeric(10, 7))
+    # Collation "C", чтобы range-поиск по префиксу шёл по B-tree индексу
+    geohash = Column(String(GEOHASH_PRECISION, collation="C"))
     is_available = Column(Boolean, default=True, index=True)
-    # created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Вычисляется самой БД; в Python не загружается
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{SEARCH_TS_CONFIG}', coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+    ))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     # updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Связи
@@ -30,6 +49,16 @@ class Item(Base):
     conversations = relationship("Conversation", back_populates="item")
 
 
+@event.listens_for(Item, "before_insert")
+@event.listens_for(Item, "before_update")
+def _sync_geohash(mapper, connection, target: Item) -> None:
+    """Держим geohash в актуальном состоянии при изменении координат"""
+    if target.latitude is None or target.longitude is None:
+        target.geohash = None
+    else:
+        target.geohash = geohash_encode(float(target.latitude), float(target.longitude))
+
+
 class ItemImage(Base):
     __tablename__ = "item_images"
 
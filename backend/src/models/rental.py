@@ -7,6 +7,10 @@ import uuid
 
 class Rental(Base):
     __tablename__ = "rentals"
+    __table_args__ = (
+        # Проверка пересечения периодов: WHERE item_id = ? AND starts_at < ? AND ends_at > ?
+        Index("ix_rentals_item_period", "item_id", "starts_at", "ends_at"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     item_id = Column(PG_UUID(as_uuid=True), ForeignKey("items.id", ondelete="RESTRICT"), nullable=False, index=True)
@@ -7,7 +7,11 @@ import uuid
 
 class Review(Base):
     __tablename__ = "reviews"
-    __table_args__ = (UniqueConstraint("rental_id", name="uq_review_rental"),)
+    __table_args__ = (
+        UniqueConstraint("rental_id", name="uq_review_rental"),
+        # Лента отзывов о пользователе: WHERE recipient_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_reviews_recipient_created_id", "recipient_id", "created_at", "id"),
+    )
 
     id = Column(PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     rental_id = Column(PG_UUID(as_uuid=True), ForeignKey("rentals.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
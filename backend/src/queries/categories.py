@@ -1,11 +1,18 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 from typing import List
 from src.queries import Repository
 from src.models.category import Category
-from typing import Optional
+from src.config import settings
+from typing import Optional, Tuple
 
 from pydantic import BaseModel
 from uuid import UUID
+import asyncio
+import hashlib
+import json
+import time
 
 class CategoryResponse(BaseModel):
     id: UUID
@@ -18,4 +25,84 @@ class CategoryResponse(BaseModel):
 async def get_all_categories(db: AsyncSession) -> List[CategoryResponse]:
     repo = Repository(db)
     categories = await repo.categories.get_all_with_children()
-    return [CategoryResponse.model_validate(cat) for cat in categories]
\ No newline at end of file
+    return [CategoryResponse.model_validate(cat) for cat in categories]
+
+
+async def build_category_tree(db: AsyncSession) -> list:
+    """Вложенное дерево [{id, name, children: [...]}, ...] из строк рекурсивного CTE"""
+    repo = Repository(db)
+    rows = await repo.categories.get_tree_rows()
+    nodes = {}
+    roots = []
+    # Строки идут по возрастанию depth, поэтому родитель всегда обработан раньше детей
+    for row in rows:
+        node = {"id": str(row.id), "name": row.name, "children": []}
+        nodes[row.id] = node
+        parent = nodes.get(row.parent_id)
+        if parent is None:
+            roots.append(node)
+        else:
+            parent["children"].append(node)
+    return roots
+
+
+class CategoryTreeCache:
+    """
+    Готовый JSON дерева категорий и его ETag.
+    Сбрасывается после коммита, изменившего категории, и по TTL.
+    Поколение не даёт сохранить дерево, собранное до сброса.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._body is not None and time.monotonic() < self._expires_at
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._body = None
+        self._etag = None
+
+    async def get(self, db: AsyncSession) -> Tuple[bytes, str]:
+        if self._fresh():
+            return self._body, self._etag
+        async with self._lock:
+            if self._fresh():
+                return self._body, self._etag
+            generation = self._generation
+            tree = await build_category_tree(db)
+            body = json.dumps(tree, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            if generation == self._generation:
+                self._body, self._etag = body, etag
+                self._expires_at = time.monotonic() + self.ttl_seconds
+            return body, etag
+
+
+category_tree_cache = CategoryTreeCache(ttl_seconds=settings.CATEGORY_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(Category, "after_insert")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+def _mark_categories_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info["categories_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_category_tree(session):
+    if session.info.pop("categories_changed", False):
+        category_tree_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_category_changes(session):
+    session.info.pop("categories_changed", None)
@@ -1,12 +1,12 @@
 # src/queries/chats.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
 
 from src.queries import Repository
 from src.models.message import Message
 from src.models.conversation import Conversation
-from src.models.item import Item
 
 from pydantic import BaseModel
 
@@ -15,40 +15,80 @@ class MessageResponse(BaseModel):
     conversation_id: UUID
     sender_id: UUID
     message_text: str
-    created_at: str
+    created_at: datetime
 
     class Config:
         from_attributes = True
 
 class ConversationResponse(BaseModel):
     id: UUID
-    item_id: UUID
-    updated_at: str
+    item_id: Optional[UUID]
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    last_message_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
-async def start_conversation(
-    db: AsyncSession, item_id: UUID, current_user_id: UUID
-) -> ConversationResponse:
+class InboxLastMessage(BaseModel):
+    id: UUID
+    sender_id: UUID
+    message_text: str
+    message_type: Optional[str]
+    created_at: datetime
+
+class InboxEntry(BaseModel):
+    conversation_id: UUID
+    item_id: Optional[UUID]
+    last_message_at: datetime
+    last_read_at: Optional[datetime]
+    unread_count: int
+    last_message: Optional[InboxLastMessage]
+
+class InboxPage(BaseModel):
+    conversations: List[InboxEntry]
+    # id последней беседы страницы; передаётся в before для следующей страницы
+    next_cursor: Optional[UUID] = None
+
+async def get_user_conversations(db: AsyncSession, user_id: UUID) -> List[ConversationResponse]:
     repo = Repository(db)
-    item = await repo.items.get_by_id(Item, item_id)
-    if not item:
-        raise ValueError("Item not found")
-    user_ids = [current_user_id, item.owner_id]
-    conv = await repo.conversations.get_or_create_conversation(item_id, user_ids)
-    return ConversationResponse.model_validate(conv)
+    rows = await repo.conversations.get_user_conversations(user_id)
+    return [ConversationResponse.model_validate(dict(row)) for row in rows]
 
 async def get_conversation_messages(
-    db: AsyncSession, conversation_id: UUID, limit: int = 50
+    db: AsyncSession,
+    conversation_id: UUID,
+    limit: int = 50,
+    before: Optional[UUID] = None,
+    after: Optional[UUID] = None,
 ) -> List[MessageResponse]:
     repo = Repository(db)
-    messages = await repo.messages.get_messages_in_conversation(conversation_id, limit=limit)
+    messages = await repo.messages.get_messages_in_conversation(
+        conversation_id, limit=limit, before=before, after=after
+    )
     return [MessageResponse.model_validate(m) for m in messages]
 
-async def send_message(
-    db: AsyncSession, conversation_id: UUID, sender_id: UUID, text: str
-) -> MessageResponse:
+async def get_inbox(
+    db: AsyncSession, user_id: UUID, limit: int = 30, before: Optional[UUID] = None
+) -> InboxPage:
     repo = Repository(db)
-    msg = await repo.messages.create_message(conversation_id, sender_id, text)
-    return MessageResponse.model_validate(msg)
\ No newline at end of file
+    rows = await repo.conversations.get_inbox(user_id, limit=limit, before=before)
+    entries = [
+        InboxEntry(
+            conversation_id=row.conversation_id,
+            item_id=row.item_id,
+            last_message_at=row.last_message_at,
+            last_read_at=row.last_read_at,
+            unread_count=row.unread_count,
+            last_message=InboxLastMessage(
+                id=row.message_id,
+                sender_id=row.sender_id,
+                message_text=row.message_text,
+                message_type=row.message_type,
+                created_at=row.created_at,
+            ) if row.message_id else None,
+        )
+        for row in rows
+    ]
+    next_cursor = entries[-1].conversation_id if len(entries) == limit else None
+    return InboxPage(conversations=entries, next_cursor=next_cursor)
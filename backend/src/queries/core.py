@@ -1,4 +1,4 @@
-from sqlalchemy import select, insert, update, delete
+from sqlalchemy import select, insert, update, delete, func, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.engine import Result
 from typing import List, Optional, Any, Type, TypeVar
@@ -8,7 +8,22 @@ logger = logging.getLogger(__name__)
 
 ModelType = TypeVar('ModelType')
 
+
+def _has_mapper_hooks(model: Type[ModelType], *event_names: str) -> bool:
+    """Есть ли у модели слушатели событий маппера (before_update, after_delete, ...)"""
+    dispatch = inspect(model).dispatch
+    return any(getattr(dispatch, name) for name in event_names)
+
 class DatabaseManager:
+    """
+    Базовые операции репозиториев. Методы записи только flush'ат изменения в текущую
+    транзакцию; коммитит вызывающий эндпоинт (src.database.unit_of_work.commit).
+    Серверные значения (created_at, updated_at, ...) приходят через RETURNING, без refresh.
+    update/delete — массовые UPDATE/DELETE ... RETURNING, кроме моделей с событиями маппера.
+    """
+    # Строк в одном многострочном INSERT ... RETURNING
+    BULK_INSERT_BATCH_SIZE = 1000
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
@@ -29,51 +44,90 @@ class DatabaseManager:
         try:
             instance = model(**data)
             self.session.add(instance)
-            await self.session.commit()
-            await self.session.refresh(instance)
+            # INSERT ... RETURNING: server_default-колонки заполняются при flush
+            await self.session.flush()
             return instance
         except Exception as e:
-            await self.session.rollback()
             logger.error(f"Error creating record in {model.__name__}: {e}")
             raise
 
-    async def bulk_create(self, model: Type[ModelType], data_list: List[dict]) -> List[ModelType]:
+    async def bulk_insert(
+        self, model: Type[ModelType], data_list: List[dict], batch_size: Optional[int] = None
+    ) -> List[ModelType]:
+        """
+        Многострочный INSERT ... RETURNING: один запрос на batch_size строк,
+        сгенерированные id и server_default приходят сразу, без refresh.
+        ORM-события before_insert при этом не вызываются.
+        """
+        if not data_list:
+            return []
+        stmt = (
+            insert(model)
+            .returning(model, sort_by_parameter_order=True)
+            .execution_options(insertmanyvalues_page_size=batch_size or self.BULK_INSERT_BATCH_SIZE)
+        )
+        result = await self.session.scalars(stmt, data_list)
+        return result.all()
+
+    async def bulk_create(
+        self, model: Type[ModelType], data_list: List[dict], batch_size: Optional[int] = None
+    ) -> List[ModelType]:
         try:
-            instances = [model(**data) for data in data_list]
-            self.session.add_all(instances)
-            await self.session.commit()
-            for instance in instances:
-                await self.session.refresh(instance)
-            return instances
+            return await self.bulk_insert(model, data_list, batch_size)
         except Exception as e:
-            await self.session.rollback()
             logger.error(f"Error bulk creating records in {model.__name__}: {e}")
             raise
 
     async def update(self, model: Type[ModelType], record_id, **data) -> Optional[ModelType]:
+        """
+        UPDATE ... RETURNING одним запросом вместо SELECT + UPDATE + refresh.
+        Массовый UPDATE идёт мимо событий маппера, поэтому модели со слушателями
+        before_update/after_update (geohash у Item, сброс кеша категорий) обновляются
+        через загрузку объекта и flush.
+        """
         try:
-            instance = await self.get_by_id(model, record_id)
-            if instance:
-                for key, value in data.items():
-                    setattr(instance, key, value)
-                await self.session.commit()
-                await self.session.refresh(instance)
-            return instance
+            if _has_mapper_hooks(model, "before_update", "after_update"):
+                instance = await self.session.get(model, record_id)
+                if instance is None:
+                    return None
+                for field_name, value in data.items():
+                    setattr(instance, field_name, value)
+                await self.session.flush()
+                # onupdate-колонки после flush просрочены, а ленивой загрузки в async нет
+                expired = inspect(instance).expired_attributes
+                if expired:
+                    await self.session.refresh(instance, attribute_names=list(expired))
+                return instance
+            result = await self.session.execute(
+                update(model)
+                .where(model.id == record_id)
+                .values(**data)
+                .returning(model)
+                .execution_options(populate_existing=True)
+            )
+            return result.scalar_one_or_none()
         except Exception as e:
-            await self.session.rollback()
             logger.error(f"Error updating record in {model.__name__}: {e}")
             raise
 
     async def delete(self, model: Type[ModelType], record_id) -> bool:
+        """
+        DELETE ... RETURNING id: без предварительной загрузки строки. Модели со слушателями
+        before_delete/after_delete удаляются через session.delete и flush, чтобы события сработали.
+        """
         try:
-            instance = await self.get_by_id(model, record_id)
-            if instance:
+            if _has_mapper_hooks(model, "before_delete", "after_delete"):
+                instance = await self.session.get(model, record_id)
+                if instance is None:
+                    return False
                 await self.session.delete(instance)
-                await self.session.commit()
+                await self.session.flush()
                 return True
-            return False
+            result = await self.session.execute(
+                delete(model).where(model.id == record_id).returning(model.id)
+            )
+            return result.first() is not None
         except Exception as e:
-            await self.session.rollback()
             logger.error(f"Error deleting record in {model.__name__}: {e}")
             raise
 
@@ -93,6 +147,29 @@ class DatabaseManager:
         instance = await self.get_by_id(model, record_id)
         return instance is not None
 
-    async def count(self, model: Type[ModelType]) -> int:
-        result = await self.session.execute(select(model))
-        return len(result.scalars().all())
\ No newline at end of file
+    async def count(self, model: Type[ModelType], *criteria, **filters) -> int:
+        """
+        SELECT count(*) с необязательными условиями:
+        count(Item, Item.price_per_day < 100, owner_id=user_id)
+        """
+        stmt = select(func.count()).select_from(model)
+        if criteria:
+            stmt = stmt.where(*criteria)
+        for field_name, value in filters.items():
+            stmt = stmt.where(getattr(model, field_name) == value)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def estimated_count(self, model: Type[ModelType]) -> int:
+        """
+        Приблизительное число строк из статистики планировщика (pg_class.reltuples),
+        без обхода таблицы. Для таблиц, по которым ещё не было ANALYZE, считает точно.
+        """
+        result = await self.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"),
+            {"table_name": model.__table__.fullname},
+        )
+        estimate = result.scalar_one_or_none()
+        if estimate is None or estimate < 0:
+            return await self.count(model)
+        return estimate
\ No newline at end of file
@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
+from datetime import datetime
 
 from src.queries import Repository
+from src.queries.orm import ItemSearchFilters
 from src.models.item import Item
 
 from pydantic import BaseModel
@@ -33,6 +35,7 @@ class ItemResponse(BaseModel):
     latitude: float
     longitude: float
     is_available: bool
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -52,10 +55,31 @@ class ItemResponse(BaseModel):
             longitude=float(item.longitude),
             is_available=item.is_available,
             # image_urls=[img.image_url for img in sorted(item.images, key=lambda x: x.order_index)],
-            # created_at=item.created_at.isoformat() if item.created_at else ""
+            created_at=item.created_at,
         )
 
 
+class ItemNearResponse(ItemResponse):
+    distance_km: float
+
+
+class OwnerItemResponse(ItemResponse):
+    image_urls: PydList[str] = []
+
+
+class CategoryFacet(BaseModel):
+    category_id: UUID
+    count: int
+
+
+class ItemSearchPage(BaseModel):
+    items: PydList[ItemNearResponse]
+    # id последнего предмета страницы; передаётся в after для следующей страницы
+    next_cursor: Optional[UUID] = None
+    # Только на первой странице: сколько найдено в каждой категории
+    facets: Optional[PydList[CategoryFacet]] = None
+
+
 async def create_item(db: AsyncSession, item: ItemCreate) -> ItemResponse:
     repo = Repository(db)
     item_data = item.dict(exclude={"image_urls"})
@@ -63,11 +87,31 @@ async def create_item(db: AsyncSession, item: ItemCreate) -> ItemResponse:
     return ItemResponse.from_orm(db_item)
 
 async def search_items_near(
-    db: AsyncSession, lat: float, lon: float, radius_km: float = 5.0
-) -> List[ItemResponse]:
+    db: AsyncSession,
+    filters: ItemSearchFilters,
+    limit: int = 50,
+    after: Optional[UUID] = None,
+) -> ItemSearchPage:
+    repo = Repository(db)
+    rows = await repo.items.get_available_items_near(filters, limit=limit, after=after)
+    items = [
+        ItemNearResponse.model_validate({**row, "distance_km": round(row["distance_km"], 3)})
+        for row in rows
+    ]
+    next_cursor = items[-1].id if len(items) == limit else None
+
+    facets = None
+    if after is None:
+        facets = [
+            CategoryFacet(category_id=category_id, count=count)
+            for category_id, count in await repo.items.get_category_facets(filters)
+        ]
+    return ItemSearchPage(items=items, next_cursor=next_cursor, facets=facets)
+
+async def get_owner_items(db: AsyncSession, owner_id: UUID) -> List[OwnerItemResponse]:
     repo = Repository(db)
-    items = await repo.items.get_available_items_near(lat, lon, radius_km)
-    return [ItemResponse.model_validate(item) for item in items]
+    rows = await repo.items.get_by_owner(owner_id)
+    return [OwnerItemResponse.model_validate(dict(row)) for row in rows]
 
 async def get_item_by_id(db: AsyncSession, item_id: UUID) -> Optional[ItemResponse]:
     repo = Repository(db)
@@ -1,18 +1,53 @@
-from sqlalchemy import select, and_, func, or_, update
+from sqlalchemy import select, and_, func, or_, update, cast, tuple_, literal, case, exists, Float, String
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import selectinload, aliased
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
+from datetime import datetime
+from dataclasses import dataclass
+from decimal import Decimal
 
 from .core import DatabaseManager
+from ..database.unit_of_work import on_commit
+from ..utils.geo import EARTH_RADIUS_KM, geohash_cover, geohash_prefix_upper_bound, geohash_encode
+from ..realtime.events import publish_new_message
+from ..utils.auth_cache import user_status_cache, USER_ACTIVE, USER_BLOCKED, USER_MISSING
 from ..models.user import User, UserAuth
-from ..models.item import Item, ItemImage
+from ..models.item import Item, ItemImage, SEARCH_TS_CONFIG
 from ..models.category import Category
 from ..models.review import Review
 from ..models.rental import Rental
 from ..models.conversation import Conversation, ConversationParticipant
 from ..models.message import Message
 
+# Статусы аренды, которые занимают предмет на период
+BLOCKING_RENTAL_STATUSES = ("confirmed", "active")
+
+# Сортировки поиска предметов
+SORT_DISTANCE = "distance"
+SORT_PRICE = "price"
+SORT_NEWEST = "newest"
+# Предметы без цены за день при сортировке по цене идут в конце (максимум Numeric(10, 2))
+PRICE_SORT_NULLS_LAST = Decimal("99999999.99")
+
+
+@dataclass
+class ItemSearchFilters:
+    lat: float
+    lon: float
+    radius_km: float = 5.0
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+    category_id: Optional[UUID] = None
+    min_price_per_day: Optional[float] = None
+    max_price_per_day: Optional[float] = None
+    min_price_per_hour: Optional[float] = None
+    max_price_per_hour: Optional[float] = None
+    q: Optional[str] = None
+    sort: str = SORT_DISTANCE
+
 # ------------------ UserRepository ------------------
 class UserRepository(DatabaseManager):
     def __init__(self, session: AsyncSession):
@@ -25,20 +60,38 @@ class UserRepository(DatabaseManager):
     async def get_by_phone(self, phone: str) -> Optional[User]:
         return await self.get_by_field(User, "phone", phone)
 
+    async def get_auth_status(self, user_id: UUID) -> str:
+        """Статус для аутентификации: одна колонка вместо всей строки users"""
+        result = await self.session.execute(select(User.is_blocked).where(User.id == user_id))
+        row = result.first()
+        if row is None:
+            return USER_MISSING
+        return USER_BLOCKED if row.is_blocked else USER_ACTIVE
+
+    async def set_blocked(self, user_id: UUID, blocked: bool = True) -> Optional[User]:
+        return await self.update(User, user_id, is_blocked=blocked)
+
+    async def update(self, model, record_id, **data):
+        instance = await super().update(model, record_id, **data)
+        if model is User:
+            # До коммита другой запрос успел бы закешировать старый статус
+            on_commit(self.session, lambda: user_status_cache.invalidate(record_id))
+        return instance
+
+    async def delete(self, model, record_id) -> bool:
+        deleted = await super().delete(model, record_id)
+        if model is User:
+            on_commit(self.session, lambda: user_status_cache.invalidate(record_id))
+        return deleted
+
     async def create_with_auth(self, user_data: dict, auth_data: dict) -> User:
-        try:
-            user = User(**user_data)
-            self.session.add(user)
-            await self.session.flush()
-            auth_data["user_id"] = user.id
-            user_auth = UserAuth(**auth_data)
-            self.session.add(user_auth)
-            await self.session.commit()
-            await self.session.refresh(user)
-            return user
-        except Exception as e:
-            await self.session.rollback()
-            raise
+        user = User(**user_data)
+        self.session.add(user)
+        await self.session.flush()
+        auth_data["user_id"] = user.id
+        self.session.add(UserAuth(**auth_data))
+        await self.session.flush()
+        return user
 
 # ------------------ ItemRepository ------------------
 class ItemRepository(DatabaseManager):
@@ -46,26 +99,168 @@ class ItemRepository(DatabaseManager):
         super().__init__(session)
         self.model = Item
 
+    @staticmethod
+    def _distance_km(entity, lat: float, lon: float):
+        """SQL-выражение: расстояние по большому кругу (haversine) от точки до предмета"""
+        item_lat = func.radians(cast(entity.latitude, Float))
+        item_lon = func.radians(cast(entity.longitude, Float))
+        origin_lat = func.radians(literal(lat, Float))
+        origin_lon = func.radians(literal(lon, Float))
+        a = (
+            func.power(func.sin((item_lat - origin_lat) / 2), 2)
+            + func.cos(origin_lat) * func.cos(item_lat) * func.power(func.sin((item_lon - origin_lon) / 2), 2)
+        )
+        return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(literal(1.0, Float), a)))
+
+    @staticmethod
+    def _list_columns(entity) -> list:
+        """
+        Колонки предмета для списков: строки вместо ORM-объектов.
+        Numeric приводим к float в SQL, чтобы не собирать Decimal в Python.
+        """
+        return [
+            entity.id,
+            entity.owner_id,
+            entity.category_id,
+            entity.title,
+            entity.description,
+            cast(entity.price_per_hour, Float).label("price_per_hour"),
+            cast(entity.price_per_day, Float).label("price_per_day"),
+            entity.address,
+            cast(entity.latitude, Float).label("latitude"),
+            cast(entity.longitude, Float).label("longitude"),
+            entity.is_available,
+            entity.created_at,
+        ]
+
+    def _search_conditions(self, filters: "ItemSearchFilters") -> list:
+        """WHERE-условия поиска без курсора: общие для страницы и фасетов"""
+        distance = self._distance_km(Item, filters.lat, filters.lon)
+        cells = or_(*(
+            and_(Item.geohash >= prefix, Item.geohash < geohash_prefix_upper_bound(prefix))
+            for prefix in geohash_cover(filters.lat, filters.lon, filters.radius_km)
+        ))
+        conditions = [
+            # Именно "is_available", а не "IS TRUE": иначе планировщик не сопоставит
+            # условие с частичным индексом ix_items_available_geohash
+            Item.is_available,
+            cells,
+            distance <= filters.radius_km,
+        ]
+
+        if filters.starts_at is not None and filters.ends_at is not None:
+            # Anti-join по индексу (item_id, starts_at, ends_at)
+            conditions.append(~exists().where(
+                Rental.item_id == Item.id,
+                Rental.status.in_(BLOCKING_RENTAL_STATUSES),
+                Rental.starts_at < filters.ends_at,
+                Rental.ends_at > filters.starts_at,
+            ))
+
+        if filters.category_id is not None:
+            subtree = CategoryRepository.subtree_ids(filters.category_id)
+            conditions.append(Item.category_id.in_(select(subtree.c.id)))
+
+        if filters.min_price_per_day is not None:
+            conditions.append(Item.price_per_day >= filters.min_price_per_day)
+        if filters.max_price_per_day is not None:
+            conditions.append(Item.price_per_day <= filters.max_price_per_day)
+        if filters.min_price_per_hour is not None:
+            conditions.append(Item.price_per_hour >= filters.min_price_per_hour)
+        if filters.max_price_per_hour is not None:
+            conditions.append(Item.price_per_hour <= filters.max_price_per_hour)
+
+        if filters.q:
+            # GIN-индекс по items.search_vector
+            conditions.append(Item.search_vector.op("@@")(func.websearch_to_tsquery(SEARCH_TS_CONFIG, filters.q)))
+
+        return conditions
+
+    def _sort_key(self, entity, filters: "ItemSearchFilters"):
+        """(выражение сортировки, по убыванию?) для выбранной сортировки"""
+        if filters.sort == SORT_PRICE:
+            return func.coalesce(entity.price_per_day, PRICE_SORT_NULLS_LAST), False
+        if filters.sort == SORT_NEWEST:
+            return entity.created_at, True
+        return self._distance_km(entity, filters.lat, filters.lon), False
+
     async def get_available_items_near(
-        self, lat: float, lon: float, radius_km: float = 5.0
-    ) -> List[Item]:
-        delta = radius_km / 111.0  # approx degrees per km
+        self, filters: "ItemSearchFilters", limit: int = 50, after: Optional[UUID] = None
+    ) -> List[RowMapping]:
+        """
+        Доступные предметы в радиусе, отфильтрованные и отсортированные по filters.sort.
+        Кандидаты отбираются range-сканами по geohash-ячейкам, затем точный фильтр по haversine.
+        after — id последнего предмета предыдущей страницы (keyset по (ключ сортировки, id)).
+        Возвращает строки с колонками _list_columns и distance_km.
+        """
+        distance = self._distance_km(Item, filters.lat, filters.lon)
+        sort_key, descending = self._sort_key(Item, filters)
         stmt = (
-            select(Item)
-            .where(
-                Item.is_available.is_(True),
-                Item.latitude.between(lat - delta, lat + delta),
-                Item.longitude.between(lon - delta, lon + delta),
+            select(*self._list_columns(Item), distance.label("distance_km"))
+            .where(*self._search_conditions(filters))
+            .order_by(
+                *((sort_key.desc(), Item.id.desc()) if descending else (sort_key, Item.id))
             )
-            .options(selectinload(Item.images))
+            .limit(limit)
         )
+
+        if after is not None:
+            cursor_item = aliased(Item)
+            cursor_sort_key, _ = self._sort_key(cursor_item, filters)
+            cursor_value = select(cursor_sort_key).where(cursor_item.id == after).scalar_subquery()
+            position = tuple_(sort_key, Item.id)
+            cursor = tuple_(cursor_value, literal(after, PG_UUID(as_uuid=True)))
+            stmt = stmt.where(position < cursor if descending else position > cursor)
+
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return result.mappings().all()
 
-    async def get_by_owner(self, owner_id: UUID) -> List[Item]:
-        stmt = select(Item).where(Item.owner_id == owner_id).options(selectinload(Item.images))
+    async def get_category_facets(self, filters: "ItemSearchFilters") -> List[Tuple[UUID, int]]:
+        """Число найденных предметов по категориям для тех же фильтров (без пагинации)"""
+        stmt = (
+            select(Item.category_id, func.count().label("count"))
+            .where(*self._search_conditions(filters))
+            .group_by(Item.category_id)
+            .order_by(func.count().desc())
+        )
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        return [(row.category_id, row.count) for row in result]
+
+    async def bulk_insert(self, model, data_list: List[dict], batch_size: Optional[int] = None):
+        # Bulk INSERT обходит before_insert, поэтому geohash заполняем здесь
+        if model is Item:
+            data_list = [
+                {**data, "geohash": geohash_encode(float(data["latitude"]), float(data["longitude"]))}
+                if data.get("latitude") is not None and data.get("longitude") is not None
+                else data
+                for data in data_list
+            ]
+        return await super().bulk_insert(model, data_list, batch_size)
+
+    async def get_for_update(self, item_id: UUID) -> Optional[Item]:
+        """
+        Предмет с блокировкой строки до конца транзакции (SELECT ... FOR UPDATE).
+        Сериализует бронирования одного предмета, не мешая остальным.
+        """
+        result = await self.session.execute(select(Item).where(Item.id == item_id).with_for_update())
+        return result.scalar_one_or_none()
+
+    async def get_by_owner(self, owner_id: UUID) -> List[RowMapping]:
+        """Предметы владельца строками; картинки собираются в массив тем же запросом"""
+        image_urls = func.array(
+            select(ItemImage.image_url)
+            .where(ItemImage.item_id == Item.id)
+            .order_by(ItemImage.order_index)
+            .scalar_subquery(),
+            type_=ARRAY(String),
+        )
+        stmt = (
+            select(*self._list_columns(Item), image_urls.label("image_urls"))
+            .where(Item.owner_id == owner_id)
+            .order_by(Item.created_at.desc(), Item.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.mappings().all()
 
     # async def create_with_images(self, item_data: dict, image_urls: List[str]) -> Item:
     #     try:
@@ -86,22 +281,15 @@ class ItemRepository(DatabaseManager):
     #         raise
 
     async def create_with_images(self, item_data: dict, image_urls: List[str]) -> Item:
-        try:
-            item = Item(**item_data)
-            self.session.add(item)
-            await self.session.flush()
+        item = Item(**item_data)
+        self.session.add(item)
+        await self.session.flush()
 
-            images = [
-                ItemImage(item_id=item.id, image_url=url, order_index=i)
-                for i, url in enumerate(image_urls)
-            ]
-            self.session.add_all(images)
-            await self.session.commit()
-            # УБРАЛИ: await self.session.refresh(item)
-            return item
-        except Exception as e:
-            await self.session.rollback()
-            raise
+        await self.bulk_insert(ItemImage, [
+            {"item_id": item.id, "image_url": url, "order_index": i}
+            for i, url in enumerate(image_urls)
+        ])
+        return item
 # ------------------ ConversationRepository ------------------
 class ConversationRepository(DatabaseManager):
     def __init__(self, session: AsyncSession):
@@ -119,22 +307,21 @@ class ConversationRepository(DatabaseManager):
             await self.session.flush()
 
             # Добавляем участников
-            participants = [
-                ConversationParticipant(
-                    conversation_id=conv.id,
-                    user_id=user_id,
-                    is_active=True
-                )
+            await self.bulk_insert(ConversationParticipant, [
+                {"conversation_id": conv.id, "user_id": user_id, "is_active": True}
                 for user_id in user_ids
-            ]
-            self.session.add_all(participants)
-            await self.session.commit()
-            await self.session.refresh(conv)
+            ])
         return conv
 
-    async def get_user_conversations(self, user_id: UUID) -> List[Conversation]:
+    async def get_user_conversations(self, user_id: UUID) -> List[RowMapping]:
         stmt = (
-            select(Conversation)
+            select(
+                Conversation.id,
+                Conversation.item_id,
+                Conversation.created_at,
+                Conversation.updated_at,
+                Conversation.last_message_at,
+            )
             .join(ConversationParticipant)
             .where(
                 ConversationParticipant.user_id == user_id,
@@ -143,9 +330,74 @@ class ConversationRepository(DatabaseManager):
             .order_by(Conversation.updated_at.desc())
         )
         result = await self.session.execute(stmt)
-        return result.scalars().all()
-    
-    
+        return result.mappings().all()
+
+    async def get_inbox(self, user_id: UUID, limit: int = 30, before: Optional[UUID] = None):
+        """
+        Беседы пользователя с последним сообщением и счётчиком непрочитанных — одним запросом.
+        Сортировка по (last_message_at, conversation_id) DESC по индексу участников;
+        before — id беседы, после которой продолжить.
+        """
+        participant = ConversationParticipant
+        stmt = (
+            select(
+                participant.conversation_id,
+                Conversation.item_id,
+                participant.last_message_at,
+                participant.last_read_at,
+                participant.unread_count,
+                Message.id.label("message_id"),
+                Message.sender_id,
+                Message.message_text,
+                Message.message_type,
+                Message.created_at,
+            )
+            .select_from(participant)
+            .join(Conversation, Conversation.id == participant.conversation_id)
+            .outerjoin(Message, Message.id == Conversation.last_message_id)
+            .where(
+                participant.user_id == user_id,
+                participant.is_active.is_(True),
+            )
+            .order_by(participant.last_message_at.desc(), participant.conversation_id.desc())
+            .limit(limit)
+        )
+
+        if before is not None:
+            cursor = aliased(ConversationParticipant)
+            cursor_at = (
+                select(cursor.last_message_at)
+                .where(cursor.conversation_id == before, cursor.user_id == user_id)
+                .scalar_subquery()
+            )
+            stmt = stmt.where(
+                tuple_(participant.last_message_at, participant.conversation_id)
+                < tuple_(cursor_at, literal(before, PG_UUID(as_uuid=True)))
+            )
+
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def mark_read(self, conversation_id: UUID, user_id: UUID) -> None:
+        """Сбросить непрочитанные для участника и отметить входящие сообщения прочитанными"""
+        await self.session.execute(
+            update(ConversationParticipant)
+            .where(
+                ConversationParticipant.conversation_id == conversation_id,
+                ConversationParticipant.user_id == user_id,
+            )
+            .values(unread_count=0, last_read_at=func.now())
+        )
+        await self.session.execute(
+            update(Message)
+            .where(
+                Message.conversation_id == conversation_id,
+                Message.sender_id != user_id,
+                Message.is_read.is_(False),
+            )
+            .values(is_read=True, read_at=func.now())
+        )
+
     async def is_participant(self, conversation_id: UUID, user_id: UUID) -> bool:
         stmt = select(ConversationParticipant).where(
             ConversationParticipant.conversation_id == conversation_id,
@@ -172,30 +424,75 @@ class MessageRepository(DatabaseManager):
             is_read=False
         )
         self.session.add(message)
+        # Строка сообщения должна существовать до ссылки на неё из conversations
+        await self.session.flush()
 
-        # Обновляем updated_at у conversation
+        # Обновляем updated_at и последнее сообщение у conversation
         await self.session.execute(
             update(Conversation)
             .where(Conversation.id == conversation_id)
-            .values(updated_at=func.now())
+            .values(updated_at=func.now(), last_message_id=message.id, last_message_at=func.now())
+        )
+
+        # Inbox участников: отправителю сообщение сразу прочитано, остальным +1 непрочитанное
+        is_sender = ConversationParticipant.user_id == sender_id
+        participants = await self.session.execute(
+            update(ConversationParticipant)
+            .where(ConversationParticipant.conversation_id == conversation_id)
+            .values(
+                last_message_at=func.now(),
+                unread_count=case(
+                    (is_sender, ConversationParticipant.unread_count),
+                    else_=ConversationParticipant.unread_count + 1,
+                ),
+                last_read_at=case(
+                    (is_sender, func.now()),
+                    else_=ConversationParticipant.last_read_at,
+                ),
+            )
+            .returning(ConversationParticipant.user_id, ConversationParticipant.is_active)
         )
+        recipient_ids = [row.user_id for row in participants if row.is_active]
 
-        await self.session.commit()
-        await self.session.refresh(message)
+        # Рассылаем только после коммита, чтобы клиенты не увидели откатившееся сообщение
+        on_commit(self.session, lambda: publish_new_message(message, recipient_ids))
         return message
 
     async def get_messages_in_conversation(
-        self, conversation_id: UUID, limit: int = 50, offset: int = 0
+        self,
+        conversation_id: UUID,
+        limit: int = 50,
+        before: Optional[UUID] = None,
+        after: Optional[UUID] = None,
     ) -> List[Message]:
-        stmt = (
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
-            .offset(offset)
-            .limit(limit)
-        )
+        """
+        Страница сообщений беседы в хронологическом порядке.
+        Без курсоров — самые новые limit сообщений; before/after — id сообщения-границы,
+        пагинация по (created_at, id), каждая страница — один range scan по индексу.
+        """
+        position = tuple_(Message.created_at, Message.id)
+        stmt = select(Message).where(Message.conversation_id == conversation_id)
+
+        if after is not None:
+            stmt = stmt.where(position > self._message_position(after))
+            stmt = stmt.order_by(Message.created_at.asc(), Message.id.asc()).limit(limit)
+            result = await self.session.execute(stmt)
+            return result.scalars().all()
+
+        if before is not None:
+            stmt = stmt.where(position < self._message_position(before))
+        stmt = stmt.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit)
         result = await self.session.execute(stmt)
-        return result.scalars().all()
+        messages = result.scalars().all()
+        messages.reverse()
+        return messages
+
+    @staticmethod
+    def _message_position(message_id: UUID):
+        """(created_at, id) сообщения-курсора, вычисляется подзапросом в том же запросе"""
+        cursor = aliased(Message)
+        created_at = select(cursor.created_at).where(cursor.id == message_id).scalar_subquery()
+        return tuple_(created_at, literal(message_id, PG_UUID(as_uuid=True)))
 
 # ------------------ RentalRepository ------------------
 class RentalRepository(DatabaseManager):
@@ -208,24 +505,108 @@ class RentalRepository(DatabaseManager):
             or_(Rental.tenant_id == user_id, Rental.item_id.in_(
                 select(Item.id).where(Item.owner_id == user_id)
             )),
-            Rental.status.in_(["confirmed", "active"])
-        ).options(
-            selectinload(Rental.item).selectinload(Item.images),
-            selectinload(Rental.item).selectinload(Item.owner)
+            Rental.status.in_(BLOCKING_RENTAL_STATUSES)
         )
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_with_item_owner_for_update(self, rental_id: UUID) -> Optional[Tuple[Rental, UUID]]:
+        """
+        Аренда и владелец её предмета одним запросом; строка предмета блокируется
+        (FOR UPDATE OF items), как в ItemRepository.get_for_update.
+        """
+        stmt = (
+            select(Rental, Item.owner_id)
+            .join(Item, Item.id == Rental.item_id)
+            .where(Rental.id == rental_id)
+            .with_for_update(of=Item)
+        )
+        row = (await self.session.execute(stmt)).first()
+        return (row[0], row[1]) if row else None
+
+    async def has_overlap(
+        self,
+        item_id: UUID,
+        starts_at: datetime,
+        ends_at: datetime,
+        exclude_rental_id: Optional[UUID] = None,
+    ) -> bool:
+        """Есть ли подтверждённая аренда предмета, пересекающая [starts_at, ends_at)"""
+        conditions = [
+            Rental.item_id == item_id,
+            Rental.status.in_(BLOCKING_RENTAL_STATUSES),
+            Rental.starts_at < ends_at,
+            Rental.ends_at > starts_at,
+        ]
+        if exclude_rental_id is not None:
+            conditions.append(Rental.id != exclude_rental_id)
+        result = await self.session.execute(select(exists().where(*conditions)))
+        return result.scalar()
+
+    async def get_busy_intervals(
+        self, item_id: UUID, window_start: datetime, window_end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """Периоды подтверждённых аренд предмета, пересекающие окно, по возрастанию начала"""
+        stmt = (
+            select(Rental.starts_at, Rental.ends_at)
+            .where(
+                Rental.item_id == item_id,
+                Rental.status.in_(BLOCKING_RENTAL_STATUSES),
+                Rental.starts_at < window_end,
+                Rental.ends_at > window_start,
+            )
+            .order_by(Rental.starts_at)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.starts_at, row.ends_at) for row in result]
+
 # ------------------ CategoryRepository ------------------
 class CategoryRepository(DatabaseManager):
     def __init__(self, session: AsyncSession):
         super().__init__(session)
         self.model = Category
 
+    # Защита от циклов parent_id в рекурсивном запросе
+    MAX_TREE_DEPTH = 32
+
     async def get_all_with_children(self) -> List[Category]:
         stmt = select(Category)
         result = await self.session.execute(stmt)
         return result.scalars().all()
+
+    @classmethod
+    def subtree_ids(cls, category_id: UUID):
+        """Рекурсивный CTE с id категории и всех её потомков"""
+        subtree = (
+            select(Category.id, literal(0).label("depth"))
+            .where(Category.id == category_id)
+            .cte("category_subtree", recursive=True)
+        )
+        child = aliased(Category)
+        return subtree.union_all(
+            select(child.id, subtree.c.depth + 1)
+            .join(subtree, child.parent_id == subtree.c.id)
+            .where(subtree.c.depth < cls.MAX_TREE_DEPTH)
+        )
+
+    async def get_tree_rows(self):
+        """
+        Все категории одним рекурсивным CTE, от корней вниз:
+        строки (id, name, parent_id, depth), отсортированные по depth и name.
+        """
+        tree = (
+            select(Category.id, Category.name, Category.parent_id, literal(0).label("depth"))
+            .where(Category.parent_id.is_(None))
+            .cte("category_tree", recursive=True)
+        )
+        child = aliased(Category)
+        tree = tree.union_all(
+            select(child.id, child.name, child.parent_id, tree.c.depth + 1)
+            .join(tree, child.parent_id == tree.c.id)
+            .where(tree.c.depth < self.MAX_TREE_DEPTH)
+        )
+        result = await self.session.execute(select(tree).order_by(tree.c.depth, tree.c.name))
+        return result.all()
     
 
 # ==================== ReviewRepository ====================
@@ -234,15 +615,45 @@ class ReviewRepository(DatabaseManager):
         super().__init__(session)
         self.model = Review
 
-    async def get_reviews_about_user(self, user_id: UUID) -> List[Review]:
+    async def get_reviews_about_user(
+        self, user_id: UUID, limit: int = 20, before: Optional[UUID] = None
+    ) -> List[Review]:
+        """Отзывы о пользователе, новые первыми; before — id последнего отзыва предыдущей страницы"""
         stmt = (
             select(Review)
             .where(Review.recipient_id == user_id)
             .options(selectinload(Review.author))
-            .order_by(Review.created_at.desc())
+            .order_by(Review.created_at.desc(), Review.id.desc())
+            .limit(limit)
         )
+        if before is not None:
+            cursor = aliased(Review)
+            cursor_created_at = select(cursor.created_at).where(cursor.id == before).scalar_subquery()
+            stmt = stmt.where(
+                tuple_(Review.created_at, Review.id)
+                < tuple_(cursor_created_at, literal(before, PG_UUID(as_uuid=True)))
+            )
         result = await self.session.execute(stmt)
         return result.scalars().all()
+
+    async def create_review(self, review_data: dict) -> Review:
+        """Создать отзыв и обновить агрегаты рейтинга получателя в одной транзакции"""
+        review = Review(**review_data)
+        self.session.add(review)
+        await self.session.flush()
+
+        rating = review.rating
+        histogram_column = getattr(User, f"rating_{rating}_count")
+        await self.session.execute(
+            update(User)
+            .where(User.id == review.recipient_id)
+            .values({
+                User.review_count: User.review_count + 1,
+                User.rating_sum: User.rating_sum + rating,
+                histogram_column: histogram_column + 1,
+            })
+        )
+        return review
     
 
 # ------------------ Repository Facade ------------------
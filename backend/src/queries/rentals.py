@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime, time
+from datetime import datetime, time, timedelta, timezone
 
 from src.queries import Repository
 from src.models.rental import Rental
@@ -15,6 +15,20 @@ class RentalCreate(BaseModel):
     starts_at: datetime 
     ends_at: datetime    
 
+class RentalConflict(ValueError):
+    """Период пересекается с подтверждённой арендой"""
+
+class Interval(BaseModel):
+    starts_at: datetime
+    ends_at: datetime
+
+class ItemAvailability(BaseModel):
+    item_id: UUID
+    starts_at: datetime
+    ends_at: datetime
+    busy: List[Interval]
+    free: List[Interval]
+
 class RentalResponse(BaseModel):
     id: UUID
     item_id: UUID
@@ -30,19 +44,21 @@ class RentalResponse(BaseModel):
 async def create_rental(db: AsyncSession, rental: RentalCreate) -> RentalResponse:
     repo = Repository(db)
     
-    # Проверка на существование предмета
-    item = await repo.items.get_by_id(Item, rental.item_id)
+    if rental.ends_at <= rental.starts_at:
+        raise ValueError("End date must be after start date")
+
+    # Проверка на существование предмета; строка блокируется до коммита,
+    # чтобы параллельные бронирования этого предмета проверялись по очереди
+    item = await repo.items.get_for_update(rental.item_id)
     if not item:
         raise ValueError("Item not found")
     
     # Проверка статуса доступности
     if not item.is_available:
         raise ValueError("Item is not available for rent")
-    
-        
-    if rental.ends_at <= rental.starts_at:
-        raise ValueError("End date must be after start date")
-        
+
+    if await repo.rentals.has_overlap(rental.item_id, rental.starts_at, rental.ends_at):
+        raise RentalConflict("Item is already booked for these dates")
     
     # Условный пример автоматического расчёта цены
     duration_hours = (rental.ends_at - rental.starts_at).total_seconds() / 3600
@@ -72,16 +88,50 @@ async def get_user_rentals(db: AsyncSession, user_id: UUID) -> List[RentalRespon
 async def confirm_rental(db: AsyncSession, rental_id: UUID, current_user: UUID) -> RentalResponse:
     """Подтверждение аренды владельцем предмета"""
     repo = Repository(db)
-    rental = await repo.rentals.get_by_id(Rental, rental_id)
-    if not rental:
+    # Проверка владельца; блокировка предмета сериализует подтверждения пересекающихся заявок
+    found = await repo.rentals.get_with_item_owner_for_update(rental_id)
+    if not found:
         raise ValueError("Rental not found")
-    
-    # Проверка владельца
-    item = await repo.items.get_by_id(Item, rental.item_id)
-    if item.owner_id != current_user:
+    rental, owner_id = found
+    if owner_id != current_user:
         raise ValueError("Only owner can confirm rental")
+
+    if await repo.rentals.has_overlap(rental.item_id, rental.starts_at, rental.ends_at, exclude_rental_id=rental.id):
+        raise RentalConflict("Item is already booked for these dates")
     
     rental.status = "confirmed"
-    await repo.session.commit()
-    await repo.session.refresh(rental)
-    return RentalResponse.model_validate(rental)
\ No newline at end of file
+    await repo.session.flush()
+    return RentalResponse.model_validate(rental)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Наивные даты из запроса считаем UTC"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+async def get_item_availability(
+    db: AsyncSession, item_id: UUID, window_start: datetime, window_end: datetime
+) -> ItemAvailability:
+    """Занятые (слитые) и свободные интервалы предмета внутри окна"""
+    repo = Repository(db)
+    if not await repo.items.exists(Item, item_id):
+        raise ValueError("Item not found")
+
+    window_start, window_end = as_utc(window_start), as_utc(window_end)
+    busy: List[Interval] = []
+    for starts_at, ends_at in await repo.rentals.get_busy_intervals(item_id, window_start, window_end):
+        starts_at, ends_at = max(starts_at, window_start), min(ends_at, window_end)
+        if busy and starts_at <= busy[-1].ends_at:
+            busy[-1].ends_at = max(busy[-1].ends_at, ends_at)
+        else:
+            busy.append(Interval(starts_at=starts_at, ends_at=ends_at))
+
+    free: List[Interval] = []
+    cursor = window_start
+    for interval in busy:
+        if interval.starts_at > cursor:
+            free.append(Interval(starts_at=cursor, ends_at=interval.starts_at))
+        cursor = max(cursor, interval.ends_at)
+    if cursor < window_end:
+        free.append(Interval(starts_at=cursor, ends_at=window_end))
+
+    return ItemAvailability(item_id=item_id, starts_at=window_start, ends_at=window_end, busy=busy, free=free)
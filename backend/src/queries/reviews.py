@@ -41,10 +41,12 @@ async def create_review(db: AsyncSession, author_id: UUID, review: ReviewCreate)
 
     review_data = review.dict()
     review_data["author_id"] = author_id
-    db_review = await repo.reviews.create(Review, **review_data)
+    db_review = await repo.reviews.create_review(review_data)
     return ReviewResponse.model_validate(db_review)
 
-async def get_reviews_for_user(db: AsyncSession, user_id: UUID) -> List[ReviewResponse]:
+async def get_reviews_for_user(
+    db: AsyncSession, user_id: UUID, limit: int = 20, before: Optional[UUID] = None
+) -> List[ReviewResponse]:
     repo = Repository(db)
-    reviews = await repo.reviews.get_reviews_about_user(user_id)
+    reviews = await repo.reviews.get_reviews_about_user(user_id, limit=limit, before=before)
     return [ReviewResponse.model_validate(r) for r in reviews]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Optional, List, Dict
 from uuid import UUID
 from datetime import datetime
 
@@ -27,32 +27,35 @@ class UserResponse(BaseModel):
         from_attributes = True  
 
 
-async def create_user(db: AsyncSession, user: UserCreate) -> UserResponse:
-    """Создать пользователя с хэшированием пароля"""
-    from src.utils.security import get_password_hash
-    repo = Repository(db)
-
-    existing = await repo.users.get_by_email(user.email)
-    if existing:
-        raise ValueError("Email already registered")
-
-    user_data = {
-        "email": user.email,
-        "phone": user.phone,
-        "full_name": user.full_name,
-    }
-    auth_data = {
-        "password_hash": get_password_hash(user.password)
-    }
+class UserProfileResponse(UserResponse):
+    review_count: int
+    rating_average: Optional[float]
+    # оценка -> количество отзывов
+    rating_histogram: Dict[int, int]
+
+    @staticmethod
+    def from_user(user: User) -> "UserProfileResponse":
+        return UserProfileResponse(
+            id=user.id,
+            email=user.email,
+            phone=user.phone,
+            full_name=user.full_name,
+            created_at=user.created_at,
+            review_count=user.review_count,
+            rating_average=round(user.rating_sum / user.review_count, 2) if user.review_count else None,
+            rating_histogram={
+                rating: getattr(user, f"rating_{rating}_count") for rating in range(1, 6)
+            },
+        )
 
-    db_user = await repo.users.create_with_auth(user_data, auth_data)
-    return UserResponse.model_validate(db_user)
 
 async def get_user_by_id(db: AsyncSession, user_id: UUID) -> Optional[UserResponse]:
     repo = Repository(db)
     user = await repo.users.get_by_id(User, user_id)
     return UserResponse.model_validate(user) if user else None
 
-async def get_user_profile(db: AsyncSession, user_id: UUID) -> Optional[UserResponse]:
-    """Получить профиль (без паролей и приватных данных)"""
-    return await get_user_by_id(db, user_id)
\ No newline at end of file
+async def get_user_profile(db: AsyncSession, user_id: UUID) -> Optional[UserProfileResponse]:
+    """Получить профиль с рейтингом (без паролей и приватных данных)"""
+    repo = Repository(db)
+    user = await repo.users.get_by_id(User, user_id)
+    return UserProfileResponse.from_user(user) if user else None
\ No newline at end of file
@@ -0,0 +1,171 @@
+# src/realtime/broker.py
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Set
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+Subscriber = Callable[[str], None]
+
+
+class Broker(ABC):
+    """
+    Pub/sub для событий чата. Подписчики — синхронные колбэки, которые только
+    кладут payload в очередь соединения, поэтому рассылка никогда не ждёт клиентов.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscriber]] = defaultdict(set)
+
+    def subscribe(self, channel: str, callback: Subscriber) -> None:
+        self._subscribers[channel].add(callback)
+
+    def unsubscribe(self, channel: str, callback: Subscriber) -> None:
+        callbacks = self._subscribers.get(channel)
+        if callbacks is None:
+            return
+        callbacks.discard(callback)
+        if not callbacks:
+            del self._subscribers[channel]
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        for callback in list(self._subscribers.get(channel, ())):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("Chat subscriber failed on channel %s", channel)
+
+    @abstractmethod
+    async def publish(self, channel: str, payload: str) -> None:
+        """Доставить payload подписчикам channel"""
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class InMemoryBroker(Broker):
+    """Рассылка внутри одного процесса"""
+
+    async def publish(self, channel: str, payload: str) -> None:
+        self._dispatch(channel, payload)
+
+
+class PostgresBroker(Broker):
+    """
+    Рассылка между воркерами через LISTEN/NOTIFY. Каждый воркер держит одно
+    соединение на прослушивание и одно на публикацию, вне пула SQLAlchemy.
+    """
+
+    NOTIFY_CHANNEL = "chat_events"
+    # Лимит payload у NOTIFY — 8000 байт
+    MAX_PAYLOAD_BYTES = 7900
+    RECONNECT_DELAY_SECONDS = 1.0
+
+    def __init__(self, dsn: str):
+        super().__init__()
+        self.dsn = dsn
+        self._listen_conn = None
+        self._publish_conn = None
+        self._publish_lock = asyncio.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    async def start(self) -> None:
+        import asyncpg
+
+        self._stopped = False
+        try:
+            self._listen_conn = await asyncpg.connect(self.dsn)
+            self._listen_conn.add_termination_listener(self._on_terminated)
+            await self._listen_conn.add_listener(self.NOTIFY_CHANNEL, self._on_notify)
+            self._publish_conn = await asyncpg.connect(self.dsn)
+        except BaseException:
+            # Не оставлять полуоткрытое соединение до следующей попытки
+            await self._close_connections()
+            raise
+
+    async def stop(self) -> None:
+        self._stopped = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        await self._close_connections()
+
+    async def _close_connections(self) -> None:
+        """Закрыть соединения, не трогая _stopped и задачу переподключения"""
+        if self._listen_conn is not None:
+            # asyncpg зовёт termination listener и при явном close() — это не обрыв
+            self._listen_conn.remove_termination_listener(self._on_terminated)
+        for conn in (self._listen_conn, self._publish_conn):
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        self._listen_conn = self._publish_conn = None
+
+    def _on_notify(self, connection, pid, notify_channel, envelope: str) -> None:
+        channel, _, payload = envelope.partition("\n")
+        self._dispatch(channel, payload)
+
+    def _on_terminated(self, connection) -> None:
+        if self._stopped:
+            return
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return
+        logger.warning("Chat broker LISTEN connection lost, reconnecting")
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._stopped:
+            try:
+                # stop() отменил бы эту же задачу и остановил брокер навсегда
+                await self._close_connections()
+                await self.start()
+                return
+            except Exception:
+                logger.exception("Chat broker reconnect failed")
+                await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+
+    async def publish(self, channel: str, payload: str) -> None:
+        envelope = f"{channel}\n{payload}"
+        if len(envelope.encode("utf-8")) > self.MAX_PAYLOAD_BYTES:
+            raise ValueError(f"Chat event for {channel} exceeds NOTIFY payload limit")
+        import asyncpg
+
+        async with self._publish_lock:
+            # Соединение могло оборваться или ещё не подняться после _reconnect
+            if self._publish_conn is None or self._publish_conn.is_closed():
+                self._publish_conn = await asyncpg.connect(self.dsn)
+            try:
+                await self._publish_conn.execute("SELECT pg_notify($1, $2)", self.NOTIFY_CHANNEL, envelope)
+            except (asyncpg.ConnectionDoesNotExistError, asyncpg.InterfaceError):
+                logger.warning("Chat broker publish connection lost, reconnecting")
+                self._publish_conn.terminate()
+                self._publish_conn = await asyncpg.connect(self.dsn)
+                await self._publish_conn.execute("SELECT pg_notify($1, $2)", self.NOTIFY_CHANNEL, envelope)
+
+
+_broker: Optional[Broker] = None
+
+
+def get_broker() -> Broker:
+    global _broker
+    if _broker is None:
+        if settings.CHAT_BROKER == "postgres":
+            _broker = PostgresBroker(settings.DATABASE_URL_dsn)
+        else:
+            _broker = InMemoryBroker()
+    return _broker
+
+
+async def start_broker() -> None:
+    await get_broker().start()
+
+
+async def stop_broker() -> None:
+    await get_broker().stop()
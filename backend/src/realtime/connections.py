@@ -0,0 +1,51 @@
+# src/realtime/connections.py
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import WebSocket, status
+
+logger = logging.getLogger(__name__)
+
+# Клиент не успевает читать — закрываем, пусть переподключится и догрузит историю
+SLOW_CONSUMER_CLOSE_CODE = status.WS_1013_TRY_AGAIN_LATER
+
+
+class ClientConnection:
+    """
+    WebSocket-клиент с собственной ограниченной очередью отправки.
+    deliver() никогда не блокирует: если очередь переполнена, клиент помечается
+    медленным и отключается, не задерживая рассылку остальным.
+    """
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def deliver(self, payload: str) -> None:
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.dropped = True
+            # Выкидываем недоставленное и оставляем только маркер закрытия
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def run_sender(self) -> None:
+        try:
+            while True:
+                payload = await self.queue.get()
+                if payload is None:
+                    logger.info("Dropping slow WebSocket consumer")
+                    await self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+                    return
+                await self.websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Клиент отвалился во время отправки; приёмный цикл закроет соединение
+            self.dropped = True
@@ -0,0 +1,61 @@
+# src/realtime/events.py
+import json
+import logging
+from typing import Iterable
+from uuid import UUID
+
+from src.models.message import Message
+from src.realtime.broker import PostgresBroker, get_broker
+
+logger = logging.getLogger(__name__)
+
+
+def user_channel(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+# Событие вместе с каналом должно влезть в NOTIFY (лимит в байтах UTF-8);
+# длинный текст обрезается, клиент догружает сообщение через REST
+MAX_EVENT_BYTES = PostgresBroker.MAX_PAYLOAD_BYTES - len(f"{user_channel(UUID(int=0))}\n")
+
+
+def _event_json(message: Message, text: str, truncated: bool) -> str:
+    return json.dumps({
+        "type": "message.created",
+        "message": {
+            "id": str(message.id),
+            "conversation_id": str(message.conversation_id),
+            "sender_id": str(message.sender_id),
+            "message_text": text,
+            "message_type": message.message_type,
+            "created_at": message.created_at.isoformat() if message.created_at else None,
+        },
+        "truncated": truncated,
+    }, ensure_ascii=False)
+
+
+def message_event(message: Message, max_bytes: int = MAX_EVENT_BYTES) -> str:
+    text = message.message_text
+    payload = _event_json(message, text, False)
+    if len(payload.encode("utf-8")) <= max_bytes:
+        return payload
+    # Экранирование в JSON меняет размер символа, поэтому ищем самый длинный влезающий префикс
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if len(_event_json(message, text[:middle], True).encode("utf-8")) <= max_bytes:
+            low = middle
+        else:
+            high = middle - 1
+    return _event_json(message, text[:low], True)
+
+
+async def publish_new_message(message: Message, recipient_ids: Iterable[UUID]) -> None:
+    """Разослать уже закоммиченное сообщение участникам; ошибки брокера не роняют запрос"""
+    payload = message_event(message)
+    broker = get_broker()
+    for user_id in recipient_ids:
+        try:
+            await broker.publish(user_channel(user_id), payload)
+        except Exception:
+            logger.exception("Failed to publish message %s to user %s", message.id, user_id)
@@ -0,0 +1,52 @@
+# src/utils/auth_cache.py
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from uuid import UUID
+
+from src.config import settings
+
+USER_ACTIVE = "active"
+USER_BLOCKED = "blocked"
+USER_MISSING = "missing"
+
+
+class UserStatusCache:
+    """
+    Кеш статуса пользователя для аутентификации: существует ли он и не заблокирован ли.
+    Живёт в памяти процесса; явная инвалидация работает только в текущем воркере,
+    в остальных запись устаревает не позже чем через ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[UUID, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, user_id: UUID) -> Optional[str]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, status = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        return status
+
+    def set(self, user_id: UUID, status: str) -> None:
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, status)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+user_status_cache = UserStatusCache(
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+)
@@ -0,0 +1,110 @@
+# src/utils/geo.py
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+GEOHASH_PRECISION = 9
+# Максимум ячеек, которыми покрываем область поиска (одна ячейка = один range scan)
+MAX_COVER_CELLS = 16
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash точки (стандартный base32 алфавит)"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            if lon >= mid:
+                bits = (bits << 1) | 1
+                lon_lo = mid
+            else:
+                bits <<= 1
+                lon_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """Размер ячейки в градусах: (высота по широте, ширина по долготе)"""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Описанный прямоугольник вокруг круга (min_lat, max_lat, min_lon, max_lon).
+    Дельта по долготе растёт с широтой; у полюсов берём всю долготу.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    min_lat = max(lat - lat_delta, -90.0)
+    max_lat = min(lat + lat_delta, 90.0)
+
+    max_abs_lat = max(abs(min_lat), abs(max_lat))
+    cos_lat = math.cos(math.radians(max_abs_lat))
+    if cos_lat < 1e-9 or radius_km / (KM_PER_DEGREE_LAT * cos_lat) >= 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+
+    lon_delta = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+    return min_lat, max_lat, lon - lon_delta, lon + lon_delta
+
+
+def _normalize_lon(lon: float) -> float:
+    return ((lon + 180.0) % 360.0) - 180.0
+
+
+def geohash_cover(lat: float, lon: float, radius_km: float) -> List[str]:
+    """
+    Набор geohash-префиксов, полностью покрывающих круг поиска.
+    Берём самую точную длину префикса, при которой ячеек не больше MAX_COVER_CELLS.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lon = geohash_cell_size(precision)
+        rows = int(math.floor(max_lat / cell_lat) - math.floor(min_lat / cell_lat)) + 1
+        cols = int(math.floor(max_lon / cell_lon) - math.floor(min_lon / cell_lon)) + 1
+        if rows * cols > MAX_COVER_CELLS:
+            continue
+
+        # Шаг выборки равен размеру ячейки, поэтому ни одна ячейка не пропускается
+        sample_lats = [min_lat + r * cell_lat for r in range(rows)] + [max_lat]
+        sample_lons = [min_lon + c * cell_lon for c in range(cols)] + [max_lon]
+        cells = {
+            geohash_encode(min(s_lat, max_lat), _normalize_lon(min(s_lon, max_lon)), precision)
+            for s_lat in sample_lats
+            for s_lon in sample_lons
+        }
+        return sorted(cells)
+
+    # Область больше, чем покрывает любой префикс длины 1 — ищем без ограничения по ячейкам
+    return [""]
+
+
+def geohash_prefix_upper_bound(prefix: str) -> str:
+    """Верхняя граница для range-поиска по префиксу (все символы base32 < '~')"""
+    return prefix + "~"
+
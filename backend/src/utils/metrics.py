@@ -0,0 +1,187 @@
+# src/utils/metrics.py
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+LabelValues = Tuple[str, ...]
+
+
+class RequestStats:
+    """Что запрос успел сделать с БД; заполняется хуками engine и пула"""
+
+    __slots__ = ("db_queries", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def start_request_stats() -> Tuple[RequestStats, object]:
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def finish_request_stats(token) -> None:
+    _request_stats.reset(token)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def record_pool_wait(seconds: float) -> None:
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.pool_wait_seconds += seconds
+
+
+class Histogram:
+    """Гистограмма в формате Prometheus: накопительные бакеты, сумма и количество по набору меток"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # метки -> [счётчики по бакетам (последний = +Inf), сумма]
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} histogram")
+        for labels, (counts, total) in sorted(self._series.items()):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}le="{_format_float(bound)}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{base}le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base.rstrip(',')}}} {_format_float(total)}")
+            lines.append(f"{self.name}_count{{{base.rstrip(',')}}} {cumulative}")
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._series: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues, amount: float = 1) -> None:
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help_text}")
+        lines.append(f"# TYPE {self.name} counter")
+        for labels, value in sorted(self._series.items()):
+            base = _format_labels(self.label_names, labels).rstrip(",")
+            lines.append(f"{self.name}{{{base}}} {_format_float(value)}")
+
+
+def _format_labels(names: Sequence[str], values: LabelValues) -> str:
+    return "".join(f'{name}="{_escape(value)}",' for name, value in zip(names, values))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Метрики HTTP-запросов процесса; метка route — шаблон пути, а не сам URL"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Counter(
+            "http_requests_total", "HTTP requests", ("method", "route", "status"),
+        )
+        self.latency = Histogram(
+            "http_request_duration_seconds", "Request latency", ("method", "route"), LATENCY_BUCKETS,
+        )
+        self.db_queries = Histogram(
+            "http_request_db_queries", "SQL statements per request", ("method", "route"), QUERY_COUNT_BUCKETS,
+        )
+        self.db_time = Histogram(
+            "http_request_db_seconds", "Time spent in SQL per request", ("method", "route"), LATENCY_BUCKETS,
+        )
+        self.pool_wait = Histogram(
+            "http_request_pool_wait_seconds", "Connection pool checkout wait per request", ("method", "route"),
+            LATENCY_BUCKETS,
+        )
+        self.response_size = Histogram(
+            "http_response_size_bytes", "Response body size", ("method", "route"), SIZE_BUCKETS,
+        )
+
+    def observe_request(
+        self, method: str, route: str, status: int, duration: float, stats: RequestStats, response_bytes: int
+    ) -> None:
+        labels = (method, route)
+        with self._lock:
+            self.requests.inc((method, route, str(status)))
+            self.latency.observe(labels, duration)
+            self.db_queries.observe(labels, stats.db_queries)
+            self.db_time.observe(labels, stats.db_seconds)
+            self.pool_wait.observe(labels, stats.pool_wait_seconds)
+            self.response_size.observe(labels, response_bytes)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for metric in (self.requests, self.latency, self.db_queries, self.db_time, self.pool_wait, self.response_size):
+                metric.render(lines)
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats.db_queries += 1
+    stats.db_seconds += time.perf_counter() - started.pop()
+
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def install_engine_hooks(engine: AsyncEngine) -> None:
+    """Считать SQL-запросы и время в БД для текущего HTTP-запроса"""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
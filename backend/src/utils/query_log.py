@@ -0,0 +1,141 @@
+# src/utils/query_log.py
+import os
+import re
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Откуда пришёл запрос ищем среди кадров слоя запросов (src/queries)
+_QUERIES_DIR = os.sep + os.path.join("src", "queries") + os.sep
+# Списки параметров ($1, $2, ...) разной длины — это один и тот же запрос
+_PARAMS_RE = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Код выполнил больше SQL-запросов, чем разрешено бюджетом"""
+
+
+def statement_shape(statement: str) -> str:
+    """Текст запроса без различий в количестве параметров"""
+    return _PARAMS_RE.sub("?", " ".join(statement.split()))
+
+
+def _query_origin() -> Optional[str]:
+    """
+    Метод слоя запросов, выполнивший SQL: "ItemRepository.get_by_owner (orm.py:250)".
+    Async-код SQLAlchemy работает в дочернем greenlet, поэтому стек собираем и у родителей.
+    """
+    frame = sys._getframe(2)
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            code = frame.f_code
+            if _QUERIES_DIR in code.co_filename:
+                owner = frame.f_locals.get("self")
+                name = f"{type(owner).__name__}.{code.co_name}" if owner is not None else code.co_name
+                return f"{name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+            frame = frame.f_back
+        current = current.parent
+        if current is None:
+            return None
+        frame = current.gr_frame
+
+
+class QueryLog:
+    """SQL-запросы одного запроса/блока кода; origin собирается только в режиме отладки"""
+
+    def __init__(self, capture_origin: bool = False, parent: Optional["QueryLog"] = None):
+        self.capture_origin = capture_origin
+        # Внешний лог (например, query_budget вокруг запроса в режиме отладки) тоже видит запросы
+        self.parent = parent
+        self.statements: List[Tuple[str, Optional[str]]] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str) -> None:
+        log = self
+        origin = _query_origin() if self._wants_origin() else None
+        while log is not None:
+            log.statements.append((statement, origin))
+            log = log.parent
+
+    def _wants_origin(self) -> bool:
+        log = self
+        while log is not None:
+            if log.capture_origin:
+                return True
+            log = log.parent
+        return False
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int, Optional[str]]]:
+        """Запросы одной формы, выполненные threshold и более раз: (форма, сколько, откуда)"""
+        shapes = Counter()
+        origins = {}
+        for statement, origin in self.statements:
+            shape = statement_shape(statement)
+            shapes[shape] += 1
+            origins.setdefault(shape, origin)
+        return [
+            (shape, count, origins[shape])
+            for shape, count in shapes.most_common()
+            if count >= threshold
+        ]
+
+    def describe(self) -> str:
+        return "\n".join(
+            f"  {i}. {statement_shape(statement)}" + (f"  <- {origin}" if origin else "")
+            for i, (statement, origin) in enumerate(self.statements, 1)
+        )
+
+
+_query_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = _query_log.get()
+    if log is not None:
+        log.record(statement)
+
+
+def install_query_log_hooks(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def capture_queries(capture_origin: bool = False) -> Iterator[QueryLog]:
+    """Собрать SQL-запросы, выполненные внутри блока (в текущем контексте)"""
+    log = QueryLog(capture_origin=capture_origin, parent=_query_log.get())
+    token = _query_log.set(log)
+    try:
+        yield log
+    finally:
+        _query_log.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int, engine: Optional[AsyncEngine] = None) -> Iterator[QueryLog]:
+    """
+    Проверка в тестах, что блок укладывается в max_queries SQL-запросов:
+
+        with query_budget(3):
+            await client.get("/api/items/", params=...)
+    """
+    if engine is None:
+        from src.database.connection import engine
+    install_query_log_hooks(engine)
+    with capture_queries(capture_origin=True) as log:
+        yield log
+    if log.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{log.count} SQL queries, budget is {max_queries}:\n{log.describe()}"
+        )
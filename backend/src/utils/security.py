@@ -1,48 +1,219 @@
 # src/utils/security.py
-import bcrypt
-from jose import JWTError, jwt
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict
+from typing import Optional, Dict, Any, Callable, TypeVar
 from src.config import settings
 
-# Настройки JWT
-ALGORITHM = settings.ALGORITHM
-SECRET_KEY = settings.SECRET_KEY
-ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+# bcrypt и jose импортируются при первом использовании, а настройки JWT
+# читаются из settings в момент вызова: импорт модуля не тянет их при старте воркера
+
+T = TypeVar("T")
+
+
+def _password_bytes(password: str) -> bytes:
+    # Обрезаем до 72 байт для безопасности
+    password_bytes = password.encode('utf-8')
+    if len(password_bytes) > 72:
+        password_bytes = password_bytes[:72]
+    return password_bytes
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Проверка пароля"""
-    # Обрезаем до 72 байт для безопасности
-    plain_bytes = plain_password.encode('utf-8')
-    if len(plain_bytes) > 72:
-        plain_bytes = plain_bytes[:72]
-    hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(plain_bytes, hashed_bytes)
+    import bcrypt
+
+    return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode('utf-8'))
 
 def get_password_hash(password: str) -> str:
     """Хеширование пароля"""
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
+    import bcrypt
+
     salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    hashed = bcrypt.hashpw(_password_bytes(password), salt)
     return hashed.decode('utf-8')
 
+
+class PasswordHasherBusy(Exception):
+    """Очередь на хеширование паролей переполнена"""
+
+
+class PasswordHasher:
+    """
+    Выполняет bcrypt в отдельном пуле потоков, чтобы не блокировать event loop.
+    bcrypt отпускает GIL, поэтому потоки реально работают параллельно.
+    Одновременно принимается не больше workers + max_queue задач, остальные
+    сразу получают PasswordHasherBusy.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.capacity = workers + max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        # Метрики
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Создаём пул при первом использовании, а не при импорте модуля
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        # Счётчик меняется только из потока event loop, блокировка не нужна
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        self._in_flight += 1
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            result = func(*args)
+            return result, started, time.perf_counter()
+
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._get_executor(), job)
+        finally:
+            self._in_flight -= 1
+
+        wait, duration = started - submitted, finished - started
+        self.completed += 1
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        self.hash_seconds_total += duration
+        self.hash_seconds_max = max(self.hash_seconds_max, duration)
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        completed = self.completed or 1
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_ms_avg": round(self.wait_seconds_total / completed * 1000, 2),
+            "wait_ms_max": round(self.wait_seconds_max * 1000, 2),
+            "hash_ms_avg": round(self.hash_seconds_total / completed * 1000, 2),
+            "hash_ms_max": round(self.hash_seconds_max * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Проверка пароля в пуле bcrypt"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Хеширование пароля в пуле bcrypt"""
+    return await password_hasher.run(get_password_hash, password)
+
 def create_access_token(data: Dict[str, str], expires_delta: Optional[timedelta] = None) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+class TokenCache:
+    """
+    LRU-кеш уже проверенных токенов: sha256(token) -> (sub, exp).
+    Кешируются только валидные токены с exp; запись перестаёт действовать
+    ровно в момент exp, как и при проверке через jwt.decode.
+    Lock нужен для вызовов из пула потоков (sync-зависимости FastAPI).
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            user_id, exp = entry
+            if time.time() > exp:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user_id
+
+    def put(self, key: bytes, user_id: str, exp: float) -> None:
+        with self._lock:
+            self._entries[key] = (user_id, exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
 
 def verify_token(token: str) -> Optional[str]:
+    key = TokenCache.key(token)
+    user_id = token_cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    from jose import JWTError, jwt
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            token_cache.put(key, user_id, exp)
         return user_id
     except JWTError:
         return None
\ No newline at end of file
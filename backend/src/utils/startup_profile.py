@@ -0,0 +1,106 @@
+# src/utils/startup_profile.py
+"""
+Профиль холодного старта воркера:
+
+    python -m src.main --profile-startup
+
+1. Время импорта src.main по модулям (python -X importtime в отдельном процессе).
+2. Время до первого ответа в свежем процессе: импорт, lifespan, первый /health,
+   первый запрос к API (ждёт фоновую загрузку роутеров).
+"""
+import json
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+_FIRST_REQUEST_SCRIPT = """
+import asyncio, json, time
+started = time.perf_counter()
+from src.main import app, router_loader
+imported = time.perf_counter()
+
+async def main():
+    import httpx
+    timings = {"import_ms": (imported - started) * 1000}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        timings["startup_ms"] = (time.perf_counter() - started) * 1000
+        async with httpx.AsyncClient(transport=transport, base_url="http://profile") as client:
+            response = await client.get("/health")
+            timings["first_health_ms"] = (time.perf_counter() - started) * 1000
+            timings["first_health_status"] = response.status_code
+            response = await client.get("/openapi.json")
+            timings["first_api_ms"] = (time.perf_counter() - started) * 1000
+            timings["first_api_status"] = response.status_code
+    timings["routers_load_ms"] = (router_loader.load_seconds or 0) * 1000
+    print(json.dumps(timings))
+
+asyncio.run(main())
+"""
+
+
+def import_times(module: str = "src.main") -> List[Tuple[str, int, int]]:
+    """(модуль, self мкс, cumulative мкс) для каждого импорта"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def group_by_package(rows: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Собственное время импорта по пакетам верхнего уровня (src.* — по подпакетам)"""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, self_us, _ in rows:
+        parts = name.split(".")
+        key = ".".join(parts[:2]) if parts[0] == "src" else parts[0]
+        totals[key] += self_us
+    return dict(totals)
+
+
+def first_request_times() -> Dict[str, float]:
+    proc = subprocess.run(
+        [sys.executable, "-c", _FIRST_REQUEST_SCRIPT],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"startup failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def report(top: int = 20) -> None:
+    rows = import_times()
+    total_us = sum(self_us for _, self_us, _ in rows)
+    print(f"import src.main: {total_us / 1000:.0f} ms, {len(rows)} modules\n")
+
+    print(f"{'package':<40}{'self ms':>10}")
+    for name, self_us in sorted(group_by_package(rows).items(), key=lambda kv: -kv[1])[:top]:
+        print(f"{name:<40}{self_us / 1000:>10.1f}")
+
+    print(f"\n{'module':<60}{'self ms':>10}{'cumulative ms':>15}")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: -row[2])[:top]:
+        print(f"{name:<60}{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}")
+
+    print()
+    try:
+        timings = first_request_times()
+    except RuntimeError as exc:
+        print(f"time to first request: not measured ({exc})")
+        return
+    print(f"import:                    {timings['import_ms']:8.0f} ms")
+    print(f"startup (lifespan):        {timings['startup_ms']:8.0f} ms")
+    print(f"first /health:             {timings['first_health_ms']:8.0f} ms  ({timings['first_health_status']})")
+    print(f"first API request:         {timings['first_api_ms']:8.0f} ms  ({timings['first_api_status']})")
+    print(f"routers loaded in:         {timings['routers_load_ms']:8.0f} ms")
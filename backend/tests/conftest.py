@@ -0,0 +1,102 @@
+# tests/conftest.py
+"""
+Тесты работают с настоящим PostgreSQL из переменных DB_* (как приложение).
+Нужна отдельная БД: миграции применяются к ней перед тестами, данные не удаляются.
+
+    cd backend
+    DB_NAME=rent_test python -m pytest
+"""
+import os
+import uuid
+
+import pytest
+
+# Роутеры нужны сразу, без фоновой загрузки и lifespan
+os.environ.setdefault("LAZY_ROUTERS", "false")
+
+import httpx  # noqa: E402
+
+from src.database.connection import AsyncSessionLocal, engine  # noqa: E402
+from src.database.migrate import alembic_config  # noqa: E402
+from src.database.unit_of_work import commit  # noqa: E402
+from src.main import app  # noqa: E402
+from src.models.category import Category  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    from alembic import command
+
+    command.upgrade(alembic_config(), "head")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    # Соединения пула привязаны к event loop теста
+    await engine.dispose()
+
+
+async def register(client: httpx.AsyncClient) -> dict:
+    """Новый пользователь; заголовки с его токеном. Статус пользователя уже в кеше аутентификации"""
+    response = await client.post(
+        "/api/auth/register",
+        json={"email": f"{uuid.uuid4()}@example.com", "password": "password", "full_name": "Test User"},
+    )
+    assert response.status_code == 200, response.text
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    response = await client.get("/api/rentals/me", headers=headers)
+    assert response.status_code == 200, response.text
+    return headers
+
+
+@pytest.fixture
+async def owner(client):
+    return await register(client)
+
+
+@pytest.fixture
+async def tenant(client):
+    return await register(client)
+
+
+@pytest.fixture
+async def category():
+    async with AsyncSessionLocal() as session:
+        category = Category(name=f"category-{uuid.uuid4()}")
+        session.add(category)
+        await commit(session)
+        return category.id
+
+
+@pytest.fixture
+async def item(client, owner, category):
+    response = await client.post(
+        "/api/users/items",
+        headers=owner,
+        json={
+            "owner_id": str(uuid.uuid4()),
+            "category_id": str(category),
+            "title": "Drill",
+            "description": "Cordless drill",
+            "price_per_day": 10,
+            "address": "Test street 1",
+            "latitude": 55.75,
+            "longitude": 37.61,
+        },
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+@pytest.fixture
+async def conversation(client, tenant, item):
+    response = await client.post("/api/chats/start", headers=tenant, params={"item_id": item})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
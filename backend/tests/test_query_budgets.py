@@ -0,0 +1,79 @@
+# tests/test_query_budgets.py
+"""
+Число SQL-запросов на горячих эндпоинтах (COMMIT не считается). Статус пользователя
+для аутентификации уже в кеше — промах кеша добавил бы один SELECT.
+"""
+import pytest
+
+from src.queries.categories import category_tree_cache
+from src.utils.query_log import query_budget
+from src.utils.security import verify_token
+
+pytestmark = pytest.mark.anyio
+
+
+def user_id(headers: dict) -> str:
+    return verify_token(headers["Authorization"].removeprefix("Bearer "))
+
+
+async def test_send_message(client, owner, conversation):
+    # участник беседы, INSERT сообщения, UPDATE беседы, UPDATE счётчиков участников
+    with query_budget(4):
+        response = await client.post(f"/api/chats/{conversation}/messages", headers=owner, params={"text": "hi"})
+    assert response.status_code == 200, response.text
+
+
+async def test_inbox(client, owner, tenant, conversation):
+    await client.post(f"/api/chats/{conversation}/messages", headers=tenant, params={"text": "hi"})
+    with query_budget(1):
+        response = await client.get("/api/chats/inbox", headers=owner)
+    assert response.status_code == 200, response.text
+    assert response.json()["conversations"][0]["unread_count"] == 1
+
+
+async def test_item_search(client, item, category):
+    # страница предметов и фасеты по категориям
+    with query_budget(2):
+        response = await client.get(
+            "/api/items/",
+            params={
+                "lat": 55.75,
+                "lon": 37.61,
+                "q": "drill",
+                "category_id": category,
+                "max_price_per_day": 100,
+                "starts_at": "2030-01-01T10:00:00Z",
+                "ends_at": "2030-01-03T10:00:00Z",
+            },
+        )
+    assert response.status_code == 200, response.text
+    assert item in [found["id"] for found in response.json()["items"]]
+
+
+async def test_confirm_rental(client, owner, tenant, item):
+    response = await client.post(
+        "/api/rentals/",
+        headers=tenant,
+        json={
+            "item_id": item,
+            "tenant_id": user_id(tenant),
+            "starts_at": "2030-02-01T10:00:00Z",
+            "ends_at": "2030-02-03T10:00:00Z",
+        },
+    )
+    assert response.status_code == 200, response.text
+    # аренда с владельцем предмета под блокировкой, проверка пересечений, UPDATE статуса
+    with query_budget(3):
+        response = await client.post(f"/api/rentals/{response.json()['id']}/confirm", headers=owner)
+    assert response.status_code == 200, response.text
+
+
+async def test_categories(client, category):
+    category_tree_cache.invalidate()
+    with query_budget(1):
+        response = await client.get("/api/categories/")
+    assert response.status_code == 200, response.text
+    # Дальше — из кеша, без БД
+    with query_budget(0):
+        response = await client.get("/api/categories/", headers={"If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304